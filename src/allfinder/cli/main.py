@@ -9,16 +9,21 @@ Novos argumentos adicionados:
   --profile       : Nome do perfil do navegador a reutilizar.
   --use-profile   : Ativa o modo de reutilização de perfil (sessão logada).
   --list-profiles : Lista todos os perfis detectados no sistema e sai.
+  --cdp-url       : Reutiliza um Chromium já em execução via CDP.
+  --serve         : Mantém o navegador aberto e atende extrações por HTTP.
+  --server        : Envia as URLs a um servidor iniciado com --serve.
 """
 
 import asyncio
 import argparse
-from typing import List, Dict, Any
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 
+from allfinder.cli.server import RemoteExtractor, serve
 from allfinder.core.extractor import M3U8Extractor
 from allfinder.core.browser_profile import detect_available_browsers, list_profiles, print_available_profiles
 from allfinder.plugins.manager import PluginManager
@@ -26,6 +31,16 @@ from allfinder.plugins.generic.base import GenericPlugin
 
 console = Console()
 
+# Número padrão de extrações simultâneas (--concurrency). Cada extração mantém
+# uma aba aberta; limitar a concorrência evita esgotar a memória em listas grandes.
+MAX_CONCURRENT_EXTRACTIONS = 4
+
+# Sessões por host salvas entre execuções (desativadas com --fresh-session).
+SESSION_DIR = os.path.join(os.path.expanduser("~"), ".cache", "allfinder", "sessions")
+
+# Resultados de extração reaproveitados por --cache-ttl segundos.
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "allfinder", "results")
+
 
 async def process_url(
     url: str,
@@ -58,6 +73,24 @@ async def process_url(
         }
 
 
+def select_main_url(urls: List[str]) -> str:
+    """Escolhe a URL principal: a primeira playlist.m3u8 ou, na falta, a primeira."""
+    return next((u for u in urls if "playlist.m3u8" in u.lower()), urls[0])
+
+
+def format_m3u_entry(res: Dict[str, Any], main_url: str) -> str:
+    """Monta as linhas #EXTINF + URL de um resultado para o arquivo .m3u."""
+    logo = f' tvg-logo="{res["thumbnail"]}"' if res["thumbnail"] else ""
+    display_title = (
+        res["title"] if res["title"] != "Stream"
+        else f"Stream de {res['source_url']}"
+    )
+    return (
+        f'#EXTINF:-1{logo} group-title="ALLFINDER STREAMS", {display_title}\n'
+        f"{main_url}\n"
+    )
+
+
 async def main():
     parser = argparse.ArgumentParser(
         description="allfinder: Extrai URLs .m3u8 com títulos e thumbnails.",
@@ -68,6 +101,8 @@ Exemplos de uso:
   allfinder https://globoplay.globo.com/v/12345/ --browser edge --use-profile --profile "Pessoa 1"
   allfinder https://exemplo.com/live --browser chrome --use-profile
   allfinder --list-profiles
+  allfinder --serve --port 8765
+  allfinder https://exemplo.com/live --server http://127.0.0.1:8765
         """,
     )
 
@@ -104,6 +139,15 @@ Exemplos de uso:
             "Use --list-profiles para ver os perfis disponíveis."
         ),
     )
+    browser_group.add_argument(
+        "--cdp-url",
+        default=None,
+        metavar="URL",
+        help=(
+            "Conecta a um Chromium já em execução via CDP (ex: http://localhost:9222) "
+            "em vez de lançar um navegador local."
+        ),
+    )
     browser_group.add_argument(
         "--list-profiles",
         action="store_true",
@@ -131,6 +175,30 @@ Exemplos de uso:
         default=60000,
         help="Tempo limite em milissegundos (padrão: 60000).",
     )
+    exec_group.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_CONCURRENT_EXTRACTIONS,
+        metavar="N",
+        help=f"Número de URLs extraídas ao mesmo tempo (padrão: {MAX_CONCURRENT_EXTRACTIONS}).",
+    )
+    exec_group.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=0,
+        metavar="SEGUNDOS",
+        help=(
+            "Reaproveita por SEGUNDOS o resultado de uma URL já extraída, sem "
+            f"abrir o navegador (cache em {CACHE_DIR}; padrão: 0, desativado)."
+        ),
+    )
+    exec_group.add_argument(
+        "--no-block-resources",
+        action="store_false",
+        dest="block_resources",
+        default=True,
+        help="Carrega imagens, fontes, CSS e rastreadores (bloqueados por padrão).",
+    )
 
     # Opções de cookies
     cookie_group = parser.add_argument_group("Opções de Cookies")
@@ -143,6 +211,15 @@ Exemplos de uso:
         "--cookies",
         help="Caminho para um arquivo de cookies (.txt ou .json).",
     )
+    cookie_group.add_argument(
+        "--fresh-session",
+        action="store_true",
+        default=False,
+        help=(
+            "Ignora a sessão salva das execuções anteriores (cookies e "
+            f"localStorage em {SESSION_DIR}) e não salva uma nova."
+        ),
+    )
 
     # Saída
     output_group = parser.add_argument_group("Saída")
@@ -151,6 +228,30 @@ Exemplos de uso:
         help="Caminho para salvar o arquivo .m3u resultante.",
     )
 
+    # Modo servidor
+    server_group = parser.add_argument_group("Modo Servidor")
+    server_group.add_argument(
+        "--serve",
+        action="store_true",
+        default=False,
+        help=(
+            "Mantém o navegador aberto e atende POST /extract com {\"url\": ...} "
+            "em 127.0.0.1, evitando relançá-lo a cada chamada."
+        ),
+    )
+    server_group.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="Porta do servidor iniciado com --serve (padrão: 8765).",
+    )
+    server_group.add_argument(
+        "--server",
+        default=None,
+        metavar="URL",
+        help="Envia as URLs a um servidor do allfinder (ex: http://127.0.0.1:8765).",
+    )
+
     args = parser.parse_args()
 
     # Comando: listar perfis
@@ -159,64 +260,142 @@ Exemplos de uso:
         return
 
     # Valida que há URLs para processar
-    if not args.urls:
+    if not args.urls and not args.serve:
         parser.print_help()
         console.print("\n[bold red]Erro:[/] Forneça ao menos uma URL ou use --list-profiles.")
         return
 
-    # Exibe aviso se --use-profile for usado sem --no-headless
-    if args.use_profile and args.headless:
+    if args.concurrency < 1:
+        console.print("[bold red]Erro:[/] --concurrency deve ser pelo menos 1.")
+        return
+
+    if args.serve and args.urls:
+        parser.error("--serve não aceita URLs; envie-as com POST /extract ou --server.")
+
+    if args.serve and args.server:
+        console.print("[bold red]Erro:[/] --serve e --server não podem ser usados juntos.")
+        return
+
+    # Avisos sobre --use-profile: ignorado com --cdp-url e, em alguns
+    # sistemas, problemático sem --no-headless
+    if args.cdp_url and args.use_profile:
+        console.print(
+            "[bold yellow]Aviso:[/] --use-profile é ignorado com --cdp-url; "
+            "a sessão do navegador remoto é usada."
+        )
+    elif args.use_profile and args.headless:
         console.print(
             "[bold yellow]Aviso:[/] --use-profile funciona melhor com --no-headless "
             "em alguns sistemas. Se houver problemas, adicione --no-headless."
         )
 
-    extractor = M3U8Extractor(
-        headless=args.headless,
-        timeout=args.timeout,
-        cookies_from_browser=args.cookies_from_browser,
-        cookies_file=args.cookies,
-        browser=args.browser,
-        profile_name=args.profile,
-        use_profile=args.use_profile,
-    )
+    if args.server:
+        extractor = RemoteExtractor(
+            args.server, timeout=args.timeout, max_requests=args.concurrency
+        )
+    else:
+        extractor = M3U8Extractor(
+            headless=args.headless,
+            timeout=args.timeout,
+            cookies_from_browser=args.cookies_from_browser,
+            cookies_file=args.cookies,
+            browser=args.browser,
+            profile_name=args.profile,
+            use_profile=args.use_profile,
+            block_resources=args.block_resources,
+            cdp_url=args.cdp_url,
+            session_dir=None if args.fresh_session else SESSION_DIR,
+            cache_dir=CACHE_DIR,
+            cache_ttl=args.cache_ttl,
+            max_pages=args.concurrency,
+        )
 
     plugin_manager = PluginManager()
 
-    results = []
+    if args.serve:
+        try:
+            await serve(
+                extractor,
+                plugin_manager,
+                port=args.port,
+            )
+        except OSError as e:
+            console.print(f"[bold red]Erro ao iniciar o servidor:[/] {e}")
+        return
+
+    # O limite de --concurrency fica no extrator (max_pages/max_requests):
+    # URLs em cache ou repetidas não ocupam vaga enquanto aguardam.
+    async def indexed_process_url(
+        index: int, url: str, progress: Progress
+    ) -> Tuple[int, Union[Dict[str, Any], Exception]]:
+        try:
+            return index, await process_url(url, extractor, plugin_manager, progress)
+        except Exception as e:
+            return index, e
+
+    # O .m3u é aberto antes da extração e cada entrada é gravada assim que sua
+    # URL termina: o primeiro resultado fica disponível sem esperar a mais
+    # lenta, e uma interrupção no meio deixa um arquivo parcial válido. Abrir
+    # antes de lançar o navegador evita deixá-lo órfão se o caminho for inválido.
+    output_file = None
+    if args.output:
+        try:
+            output_file = open(args.output, "w", encoding="utf-8")
+        except OSError as e:
+            console.print(f"[bold red]Erro ao abrir o arquivo de saída:[/] {e}")
+            return
+        output_file.write("#EXTM3U\n")
+        output_file.flush()
+
+    # O navegador é lançado uma única vez e compartilhado por todas as URLs.
+    try:
+        await extractor.start()
+    except Exception as e:
+        console.print(f"[bold red]Erro ao iniciar o navegador:[/] {e}")
+        if output_file:
+            output_file.close()
+        return
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(args.urls)
+    written_urls: Set[str] = set()
+
+    try:
+        # As extrações são dominadas por espera de rede, então são executadas
+        # concorrentemente no mesmo event loop.
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            tasks = [
+                indexed_process_url(index, url, progress)
+                for index, url in enumerate(args.urls)
+            ]
+            for next_result in asyncio.as_completed(tasks):
+                index, res = await next_result
+                if isinstance(res, Exception):
+                    console.print(f"[bold red]Erro ao processar {args.urls[index]}:[/] {res}")
+                    continue
+                results[index] = res
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        for url in args.urls:
-            res = await process_url(url, extractor, plugin_manager, progress)
-            results.append(res)
+                if output_file and res["urls"]:
+                    main_url = select_main_url(res["urls"])
+                    if main_url not in written_urls:
+                        written_urls.add(main_url)
+                        output_file.write(format_m3u_entry(res, main_url))
+                        output_file.flush()
+    finally:
+        await extractor.close()
+        if output_file:
+            output_file.close()
 
-    # Salva arquivo .m3u se solicitado
     if args.output:
-        with open(args.output, "w", encoding="utf-8") as f:
-            f.write("#EXTM3U\n")
-            for res in results:
-                if res["urls"]:
-                    main_url = next(
-                        (u for u in res["urls"] if "playlist.m3u8" in u.lower()),
-                        res["urls"][0],
-                    )
-                    logo = f' tvg-logo="{res["thumbnail"]}"' if res["thumbnail"] else ""
-                    display_title = (
-                        res["title"] if res["title"] != "Stream"
-                        else f"Stream de {res['source_url']}"
-                    )
-                    f.write(f'#EXTINF:-1{logo} group-title="ALLFINDER STREAMS", {display_title}\n')
-                    f.write(f"{main_url}\n")
         console.print(f"\n[bold green]✓[/] Arquivo '[bold cyan]{args.output}[/]' gerado com sucesso!")
 
     else:
         console.print("\n[bold cyan]Resultados da Extração:[/]")
         for res in results:
-            if res["title"] == "Erro":
+            if res is None or res["title"] == "Erro":
                 continue
             console.print(f"\n[bold]Título:[/] {res['title']}")
             console.print(f"[bold]Thumbnail:[/] {res['thumbnail'] or 'Não encontrada'}")
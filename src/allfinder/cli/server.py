@@ -0,0 +1,241 @@
+"""
+cli/server.py
+=============
+Modo servidor do allfinder.
+
+Mantém um único navegador aquecido e atende pedidos de extração por HTTP,
+evitando pagar a importação do Python e o lançamento do navegador a cada
+chamada da CLI. Implementado apenas com a biblioteca padrão:
+
+- serve(): servidor HTTP mínimo com um único endpoint, POST /extract,
+  que recebe {"url": "..."} e responde com o resultado da extração em JSON.
+- RemoteExtractor: cliente com a mesma interface de M3U8Extractor
+  (start/extract/close), usado pela CLI com --server.
+"""
+
+import asyncio
+import dataclasses
+import json
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional, Tuple
+
+from allfinder.core.extractor import M3U8Extractor
+from allfinder.core.network_capture import DRMInfo
+from allfinder.plugins.manager import PluginManager
+
+
+# Limite do corpo aceito em POST /extract; o pedido contém apenas uma URL.
+MAX_BODY_SIZE = 64 * 1024
+
+# Segundos para o cliente enviar cabeçalhos e corpo; sem isso, uma conexão
+# aberta e muda prenderia um handler para sempre.
+REQUEST_READ_TIMEOUT = 10.0
+
+_STATUS_TEXT = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+# ---------------------------------------------------------------------------
+# Servidor
+# ---------------------------------------------------------------------------
+
+class _PayloadTooLarge(ValueError):
+    """Corpo da requisição acima de MAX_BODY_SIZE."""
+
+
+def _encode_result(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte o resultado de extract() em um dicionário serializável."""
+    drm_info = data.get("drm_info")
+    return {
+        **data,
+        "drm_info": dataclasses.asdict(drm_info) if drm_info else None,
+    }
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Tuple[str, str, bytes]:
+    """Lê a linha de requisição, os cabeçalhos e o corpo de uma requisição HTTP."""
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    method, _, rest = request_line.partition(" ")
+    path = rest.partition(" ")[0]
+
+    content_length = 0
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+
+    if content_length > MAX_BODY_SIZE:
+        raise _PayloadTooLarge("corpo da requisição grande demais")
+    body = await reader.readexactly(content_length) if content_length else b""
+    return method.upper(), path, body
+
+
+def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {_STATUS_TEXT[status]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        + body
+    )
+
+
+async def serve(
+    extractor: M3U8Extractor,
+    plugin_manager: PluginManager,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    ready: Optional[asyncio.Event] = None,
+) -> None:
+    """
+    Inicia o navegador do extrator e atende POST /extract até ser interrompido.
+
+    As extrações compartilham o navegador e rodam concorrentemente; o número
+    de páginas abertas é limitado pelo max_pages do próprio extrator, de modo
+    que pedidos repetidos de uma URL em andamento não ocupam vagas. Se ready
+    for informado, é sinalizado quando a porta já aceita conexões.
+    """
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(
+                    _read_request(reader), REQUEST_READ_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                _write_response(writer, 408, {"error": "tempo esgotado lendo a requisição"})
+                return
+            except _PayloadTooLarge as e:
+                _write_response(writer, 413, {"error": str(e)})
+                return
+            except (ValueError, asyncio.IncompleteReadError):
+                _write_response(writer, 400, {"error": "requisição HTTP inválida"})
+                return
+
+            if path != "/extract":
+                _write_response(writer, 404, {"error": "use POST /extract"})
+                return
+            if method != "POST":
+                _write_response(writer, 405, {"error": "use POST /extract"})
+                return
+
+            try:
+                url = json.loads(body.decode("utf-8"))["url"]
+            except (ValueError, KeyError, TypeError):
+                url = None
+            if not isinstance(url, str):
+                _write_response(writer, 400, {"error": 'corpo esperado: {"url": "..."}'})
+                return
+
+            print(f"[*] Pedido de extração: {url}")
+            try:
+                data = await extractor.extract(url, plugin_manager.get_plugin_for_url(url))
+            except Exception as e:
+                print(f"[!] Erro ao processar {url}: {e}")
+                _write_response(writer, 500, {"error": str(e)})
+            else:
+                _write_response(writer, 200, _encode_result(data))
+        finally:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass  # Cliente desistiu antes da resposta
+            finally:
+                writer.close()
+
+    async with extractor:
+        server = await asyncio.start_server(handle, host, port)
+        async with server:
+            print(f"[*] Servidor allfinder ouvindo em http://{host}:{port}/extract")
+            if ready is not None:
+                ready.set()
+            await server.serve_forever()
+
+
+# ---------------------------------------------------------------------------
+# Cliente
+# ---------------------------------------------------------------------------
+
+class RemoteExtractor:
+    """
+    Encaminha extrações para um servidor iniciado com `allfinder --serve`.
+
+    Expõe a mesma interface usada pela CLI em M3U8Extractor, então o fluxo de
+    processamento e de saída não precisa saber se a extração é local ou remota.
+    """
+
+    def __init__(
+        self,
+        server_url: str,
+        timeout: int = 60000,
+        max_requests: Optional[int] = None,
+    ):
+        self.endpoint = server_url.rstrip("/") + "/extract"
+        # Margem sobre o timeout do servidor para a navegação e o fallback
+        self.timeout = timeout / 1000 * 2
+        # Máximo de requisições simultâneas ao servidor; None não limita.
+        # Sem limite, pedidos enfileirados no servidor consumiriam o timeout
+        # acima enquanto aguardam uma página livre.
+        self.max_requests = max_requests
+        self._request_slots: Optional[asyncio.Semaphore] = None
+
+    async def start(self) -> None:
+        """Nada a iniciar: o navegador vive no servidor."""
+
+    async def close(self) -> None:
+        """Nada a encerrar: o navegador vive no servidor."""
+
+    async def __aenter__(self) -> "RemoteExtractor":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+    def _post(self, url: str) -> Dict[str, Any]:
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps({"url": url}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read().decode("utf-8")).get("error")
+            except ValueError:
+                message = None
+            raise RuntimeError(message or f"servidor respondeu {e.code}") from e
+
+    async def extract(self, url: str, plugin: Optional[Any] = None) -> Dict[str, Any]:
+        """Pede a extração ao servidor; o plugin é escolhido do lado do servidor."""
+        loop = asyncio.get_running_loop()
+        if self.max_requests:
+            if self._request_slots is None:
+                self._request_slots = asyncio.Semaphore(self.max_requests)
+            async with self._request_slots:
+                data = await loop.run_in_executor(None, self._post, url)
+        else:
+            data = await loop.run_in_executor(None, self._post, url)
+        drm_info = data.get("drm_info")
+        data["drm_info"] = DRMInfo(**drm_info) if drm_info else None
+        return data
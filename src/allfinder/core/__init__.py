@@ -12,6 +12,7 @@ from allfinder.core.extractor import M3U8Extractor
 from allfinder.core.browser_profile import (
     BrowserProfile,
     detect_available_browsers,
+    iter_profiles,
     list_profiles,
     get_profile,
     print_available_profiles,
@@ -23,6 +24,7 @@ __all__ = [
 
     "BrowserProfile",
     "detect_available_browsers",
+    "iter_profiles",
     "list_profiles",
     "get_profile",
     "print_available_profiles",
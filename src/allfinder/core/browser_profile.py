@@ -11,23 +11,36 @@ de autenticação — o navegador já carrega os cookies e sessões salvas.
 Navegadores suportados: Chrome, Chromium, Edge (Edgium), Firefox.
 """
 
+import dataclasses
+import functools
 import os
 import sys
 import json
 import shutil
-import platform
-import re
-from typing import Optional, Dict, List, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Iterator, List, Set, Tuple, Any
 from dataclasses import dataclass, field
 
+# orjson é opcional: acelera a leitura dos arquivos Preferences, que podem ter
+# vários MB. Sem ele, usa o json da biblioteca padrão.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # ---------------------------------------------------------------------------
 # Estrutura de dados de um perfil de navegador
 # ---------------------------------------------------------------------------
 
-@dataclass
+# slots=True só existe a partir do Python 3.10; antes disso o dataclass
+# continua com __dict__
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class BrowserProfile:
-    """Representa um perfil de navegador detectado no sistema."""
+    """Representa um perfil de navegador detectado no sistema (imutável)."""
     browser: str          # "chrome" | "edge" | "firefox" | "chromium"
     profile_name: str     # Nome amigável (ex: "Pessoa 1", "Default")
     profile_dir: str      # Diretório do perfil (relativo ao user_data_dir)
@@ -39,33 +52,112 @@ class BrowserProfile:
 # Detecção de executáveis por sistema operacional
 # ---------------------------------------------------------------------------
 
+# Navegadores suportados, na ordem de exibição
+_BROWSERS = ("chrome", "edge", "firefox", "chromium")
+
+# Caminhos candidatos do executável de cada navegador, por sistema operacional.
+_EXECUTABLES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "chrome": {
+        "windows": (
+            r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe",
+            r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe",
+            r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe",
+        ),
+        "linux": (
+            "/usr/bin/google-chrome",
+            "/usr/bin/google-chrome-stable",
+            "/usr/bin/chromium-browser",
+            "/snap/bin/chromium",
+        ),
+        "macos": (
+            "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        ),
+    },
+    "edge": {
+        "windows": (
+            r"%PROGRAMFILES(X86)%\Microsoft\Edge\Application\msedge.exe",
+            r"%PROGRAMFILES%\Microsoft\Edge\Application\msedge.exe",
+            "msedge",
+        ),
+        "linux": (
+            "/usr/bin/microsoft-edge",
+            "/usr/bin/microsoft-edge-stable",
+            "/usr/bin/microsoft-edge-beta",
+        ),
+        "macos": (
+            "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
+        ),
+    },
+    "firefox": {
+        "windows": (
+            r"%PROGRAMFILES%\Mozilla Firefox\firefox.exe",
+            r"%PROGRAMFILES(X86)%\Mozilla Firefox\firefox.exe",
+        ),
+        "linux": (
+            "/usr/bin/firefox",
+            "/usr/bin/firefox-esr",
+            "/snap/bin/firefox",
+        ),
+        "macos": (
+            "/Applications/Firefox.app/Contents/MacOS/firefox",
+        ),
+    },
+    "chromium": {
+        "windows": (
+            r"%LOCALAPPDATA%\Chromium\Application\chrome.exe",
+        ),
+        "linux": (
+            "/usr/bin/chromium",
+            "/usr/bin/chromium-browser",
+            "/snap/bin/chromium",
+        ),
+        "macos": (
+            "/Applications/Chromium.app/Contents/MacOS/Chromium",
+        ),
+    },
+}
+
+
 def _get_os() -> str:
     """Retorna 'windows', 'linux' ou 'macos'."""
-    s = platform.system().lower()
-    if s == "windows":
+    # sys.platform é fixado na compilação do interpretador; platform.system()
+    # consultaria o SO (uname/registro) e exigiria importar o módulo platform
+    if sys.platform == "win32":
         return "windows"
-    if s == "darwin":
+    if sys.platform == "darwin":
         return "macos"
     return "linux"
 
 
-def _find_executable(candidates: List[str]) -> Optional[str]:
-    """Retorna o primeiro executável encontrado na lista de caminhos candidatos."""
+# O sistema operacional não muda durante a execução
+_OS_NAME = _get_os()
+
+
+def _find_executable(candidates: Tuple[str, ...]) -> Optional[str]:
+    """
+    Retorna o primeiro executável encontrado na lista de caminhos candidatos.
+
+    Uma única passada: caminhos (com separador) são verificados com um stat;
+    nomes simples (ex: "msedge") são procurados no PATH do sistema.
+    """
+    sep, altsep = os.sep, os.altsep
     for path in candidates:
         expanded = os.path.expandvars(os.path.expanduser(path))
-        if os.path.isfile(expanded):
-            return expanded
-    # Tenta via PATH do sistema
-    for name in candidates:
-        found = shutil.which(name)
-        if found:
-            return found
+        if sep in expanded or (altsep and altsep in expanded):
+            if os.path.isfile(expanded):
+                return expanded
+        else:
+            found = shutil.which(expanded)
+            if found:
+                return found
     return None
 
 
+@functools.lru_cache(maxsize=None)
 def find_browser_executable(browser: str) -> Optional[str]:
     """
     Localiza o executável de um navegador no sistema operacional atual.
+    O resultado é memorizado: a instalação não muda durante a execução.
 
     Parâmetros
     ----------
@@ -77,189 +169,228 @@ def find_browser_executable(browser: str) -> Optional[str]:
     str ou None
         Caminho absoluto para o executável, ou None se não encontrado.
     """
-    os_name = _get_os()
-
-    executables: Dict[str, Dict[str, List[str]]] = {
-        "chrome": {
-            "windows": [
-                r"%PROGRAMFILES%\Google\Chrome\Application\chrome.exe",
-                r"%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe",
-                r"%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe",
-            ],
-            "linux": [
-                "/usr/bin/google-chrome",
-                "/usr/bin/google-chrome-stable",
-                "/usr/bin/chromium-browser",
-                "/snap/bin/chromium",
-            ],
-            "macos": [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-            ],
-        },
-        "edge": {
-            "windows": [
-                r"%PROGRAMFILES(X86)%\Microsoft\Edge\Application\msedge.exe",
-                r"%PROGRAMFILES%\Microsoft\Edge\Application\msedge.exe",
-                "msedge",
-            ],
-            "linux": [
-                "/usr/bin/microsoft-edge",
-                "/usr/bin/microsoft-edge-stable",
-                "/usr/bin/microsoft-edge-beta",
-            ],
-            "macos": [
-                "/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge",
-            ],
-        },
-        "firefox": {
-            "windows": [
-                r"%PROGRAMFILES%\Mozilla Firefox\firefox.exe",
-                r"%PROGRAMFILES(X86)%\Mozilla Firefox\firefox.exe",
-            ],
-            "linux": [
-                "/usr/bin/firefox",
-                "/usr/bin/firefox-esr",
-                "/snap/bin/firefox",
-            ],
-            "macos": [
-                "/Applications/Firefox.app/Contents/MacOS/firefox",
-            ],
-        },
-        "chromium": {
-            "windows": [
-                r"%LOCALAPPDATA%\Chromium\Application\chrome.exe",
-            ],
-            "linux": [
-                "/usr/bin/chromium",
-                "/usr/bin/chromium-browser",
-                "/snap/bin/chromium",
-            ],
-            "macos": [
-                "/Applications/Chromium.app/Contents/MacOS/Chromium",
-            ],
-        },
-    }
-
-    candidates = executables.get(browser, {}).get(os_name, [])
-    return _find_executable(candidates)
+    return _find_executable(_EXECUTABLES.get(browser, {}).get(_OS_NAME, ()))
 
 
 # ---------------------------------------------------------------------------
 # Detecção de diretórios de perfil por navegador e SO
 # ---------------------------------------------------------------------------
 
-def _get_user_data_dirs(browser: str) -> List[str]:
+# Diretórios candidatos de dados do usuário de cada navegador, por sistema
+# operacional. "~" e variáveis de ambiente são expandidos na consulta.
+_USER_DATA_DIRS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "chrome": {
+        "windows": (r"%LOCALAPPDATA%\Google\Chrome\User Data",),
+        "linux": (
+            os.path.join("~", ".config", "google-chrome"),
+            os.path.join("~", ".config", "chromium"),
+        ),
+        "macos": (
+            os.path.join("~", "Library", "Application Support", "Google", "Chrome"),
+        ),
+    },
+    "edge": {
+        "windows": (r"%LOCALAPPDATA%\Microsoft\Edge\User Data",),
+        "linux": (
+            os.path.join("~", ".config", "microsoft-edge"),
+            os.path.join("~", ".config", "microsoft-edge-stable"),
+        ),
+        "macos": (
+            os.path.join("~", "Library", "Application Support", "Microsoft Edge"),
+        ),
+    },
+    "firefox": {
+        "windows": (r"%APPDATA%\Mozilla\Firefox\Profiles",),
+        "linux": (os.path.join("~", ".mozilla", "firefox"),),
+        "macos": (
+            os.path.join("~", "Library", "Application Support", "Firefox", "Profiles"),
+        ),
+    },
+    "chromium": {
+        "windows": (r"%LOCALAPPDATA%\Chromium\User Data",),
+        "linux": (
+            os.path.join("~", ".config", "chromium"),
+        ),
+        "macos": (
+            os.path.join("~", "Library", "Application Support", "Chromium"),
+        ),
+    },
+}
+
+
+# Diretórios de dados que já se mostraram inexistentes nesta execução. A
+# maioria das máquinas tem só um ou dois dos quatro navegadores, e o mesmo
+# processo lista perfis mais de uma vez (--list-profiles, get_profile); assim
+# as sondagens que falharam não se repetem. Executáveis ausentes já ficam
+# memorizados por find_browser_executable.
+_MISSING_DATA_DIRS: Set[str] = set()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_user_data_dirs(browser: str) -> Tuple[str, ...]:
     """Retorna os caminhos candidatos para o diretório de dados do usuário."""
-    os_name = _get_os()
-    home = os.path.expanduser("~")
-
-    dirs: Dict[str, Dict[str, List[str]]] = {
-        "chrome": {
-            "windows": [r"%LOCALAPPDATA%\Google\Chrome\User Data"],
-            "linux": [
-                os.path.join(home, ".config", "google-chrome"),
-                os.path.join(home, ".config", "chromium"),
-            ],
-            "macos": [
-                os.path.join(home, "Library", "Application Support", "Google", "Chrome"),
-            ],
-        },
-        "edge": {
-            "windows": [r"%LOCALAPPDATA%\Microsoft\Edge\User Data"],
-            "linux": [
-                os.path.join(home, ".config", "microsoft-edge"),
-                os.path.join(home, ".config", "microsoft-edge-stable"),
-            ],
-            "macos": [
-                os.path.join(home, "Library", "Application Support", "Microsoft Edge"),
-            ],
-        },
-        "firefox": {
-            "windows": [r"%APPDATA%\Mozilla\Firefox\Profiles"],
-            "linux": [os.path.join(home, ".mozilla", "firefox")],
-            "macos": [
-                os.path.join(home, "Library", "Application Support", "Firefox", "Profiles"),
-            ],
-        },
-        "chromium": {
-            "windows": [r"%LOCALAPPDATA%\Chromium\User Data"],
-            "linux": [
-                os.path.join(home, ".config", "chromium"),
-            ],
-            "macos": [
-                os.path.join(home, "Library", "Application Support", "Chromium"),
-            ],
-        },
-    }
-
-    raw_dirs = dirs.get(browser, {}).get(os_name, [])
-    return [os.path.expandvars(os.path.expanduser(d)) for d in raw_dirs]
+    raw_dirs = _USER_DATA_DIRS.get(browser, {}).get(_OS_NAME, ())
+    return tuple(os.path.expandvars(os.path.expanduser(d)) for d in raw_dirs)
 
 
 # ---------------------------------------------------------------------------
 # Enumeração de perfis Chromium-based (Chrome, Edge, Chromium)
 # ---------------------------------------------------------------------------
 
-def _list_chromium_profiles(user_data_dir: str) -> List[Tuple[str, str]]:
+def _read_local_state_names(user_data_dir: str) -> Dict[str, str]:
+    """
+    Lê os nomes de todos os perfis de uma vez a partir do arquivo "Local State"
+    (profile.info_cache), o mesmo usado pelo seletor de perfis do navegador.
+    Retorna {nome_do_diretório: nome_amigável}, vazio se não for possível ler.
+    """
+    try:
+        with open(os.path.join(user_data_dir, "Local State"), "rb") as f:
+            info_cache = _json_loads(f.read()).get("profile", {}).get("info_cache", {})
+        return {
+            dir_name: info["name"]
+            for dir_name, info in info_cache.items()
+            if isinstance(info, dict) and info.get("name")
+        }
+    except Exception:
+        return {}
+
+
+def _read_preferences_name(prefs_path: str, default: str) -> Optional[str]:
+    """
+    Lê profile.name do arquivo Preferences de um perfil. Retorna None se o
+    arquivo não existir (o diretório não é um perfil) e `default` se não for
+    possível interpretá-lo.
+    """
+    try:
+        with open(prefs_path, "rb") as f:
+            data = _json_loads(f.read())
+        return data.get("profile", {}).get("name", default)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except Exception:
+        return default
+
+
+def _list_chromium_profiles(user_data_dir: str, read_names: bool = True) -> List[Tuple[str, str]]:
     """
     Varre o diretório de dados do Chromium/Chrome/Edge e retorna uma lista de
     (nome_amigável, nome_do_diretório) para cada perfil encontrado.
+
+    Os nomes vêm do "Local State", lido uma vez para todos os perfis; o
+    Preferences de cada perfil (geralmente bem maior) só é lido para perfis
+    ausentes dele. Com read_names=False nenhum JSON é lido: o nome amigável é
+    o próprio diretório e basta o Preferences existir.
     """
     profiles: List[Tuple[str, str]] = []
-    if not os.path.isdir(user_data_dir):
+    try:
+        entries = os.scandir(user_data_dir)
+    except FileNotFoundError:
+        _MISSING_DATA_DIRS.add(user_data_dir)
+        return profiles
+    except OSError:
         return profiles
 
-    for item in os.listdir(user_data_dir):
-        item_path = os.path.join(user_data_dir, item)
-        prefs_path = os.path.join(item_path, "Preferences")
-        if os.path.isdir(item_path) and os.path.isfile(prefs_path):
-            try:
-                with open(prefs_path, "r", encoding="utf-8", errors="ignore") as f:
-                    data = json.load(f)
-                    name = data.get("profile", {}).get("name", item)
-                    profiles.append((name, item))
-            except Exception:
-                profiles.append((item, item))
+    names = _read_local_state_names(user_data_dir) if read_names else {}
+    with entries:
+        # O tipo de cada entrada vem da própria leitura do diretório, e o
+        # Preferences é aberto direto: sem stats extras por entrada
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            prefs_path = os.path.join(entry.path, "Preferences")
+            if not read_names:
+                if os.path.isfile(prefs_path):
+                    profiles.append((entry.name, entry.name))
+                continue
+            name = names.get(entry.name)
+            if name is None:
+                name = _read_preferences_name(prefs_path, entry.name)
+                if name is None:
+                    continue
+            profiles.append((name, entry.name))
 
     return profiles
 
 
+def _chromium_profile_name(user_data_dir: str, dir_name: str) -> Optional[str]:
+    """Lê o nome amigável de um único perfil Chromium (None se não houver)."""
+    name = _read_local_state_names(user_data_dir).get(dir_name)
+    if name is None:
+        name = _read_preferences_name(os.path.join(user_data_dir, dir_name, "Preferences"), dir_name)
+    return name
+
+
 # ---------------------------------------------------------------------------
 # Enumeração de perfis Firefox
 # ---------------------------------------------------------------------------
 
+def _parse_profiles_ini(lines) -> List[Tuple[str, Dict[str, str]]]:
+    """
+    Lê as seções [ProfileN] de um profiles.ini e retorna (seção, chaves).
+
+    O formato é fixo (seções e linhas chave=valor), então uma varredura linha
+    a linha basta; as chaves ficam em minúsculas, como no configparser.
+    """
+    sections: List[Tuple[str, Dict[str, str]]] = []
+    current: Optional[Dict[str, str]] = None
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            section = line[1:-1].strip()
+            current = None
+            if section.startswith("Profile"):
+                current = {}
+                sections.append((section, current))
+            continue
+        if current is not None:
+            key, sep, value = line.partition("=")
+            if sep:
+                current[key.strip().lower()] = value.strip()
+    return sections
+
+
 def _list_firefox_profiles(profiles_dir: str) -> List[Tuple[str, str]]:
     """
     Lê o arquivo profiles.ini do Firefox e retorna (nome, caminho_absoluto).
     """
     profiles: List[Tuple[str, str]] = []
-    ini_path = os.path.join(os.path.dirname(profiles_dir), "profiles.ini")
-    if not os.path.isfile(ini_path):
-        # Tenta encontrar o profiles.ini um nível acima
-        ini_path = os.path.join(profiles_dir, "..", "profiles.ini")
-
-    if os.path.isfile(ini_path):
+    # Windows/macOS guardam o profiles.ini um nível acima da pasta Profiles;
+    # no Linux ele fica dentro do próprio ~/.mozilla/firefox. Abrir direto e
+    # tratar a ausência evita um stat extra por candidato.
+    for ini_path in (
+        os.path.join(os.path.dirname(profiles_dir), "profiles.ini"),
+        os.path.join(profiles_dir, "profiles.ini"),
+    ):
         try:
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(ini_path, encoding="utf-8")
-            for section in config.sections():
-                if section.startswith("Profile"):
-                    name = config.get(section, "Name", fallback=section)
-                    path = config.get(section, "Path", fallback=None)
-                    is_relative = config.getint(section, "IsRelative", fallback=1)
-                    if path:
-                        if is_relative:
-                            abs_path = os.path.join(os.path.dirname(ini_path), path)
-                        else:
-                            abs_path = path
-                        profiles.append((name, os.path.normpath(abs_path)))
-        except Exception:
-            pass
+            with open(ini_path, encoding="utf-8", errors="replace") as f:
+                sections = _parse_profiles_ini(f)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        except OSError:
+            break
+        ini_dir = os.path.dirname(ini_path)
+        for section, keys in sections:
+            path = keys.get("path")
+            if not path:
+                continue
+            name = keys.get("name", section)
+            if keys.get("isrelative", "1").strip() != "0":
+                path = os.path.join(ini_dir, path)
+            profiles.append((name, os.path.normpath(path)))
+        break
 
     # Fallback: lista subdiretórios
-    if not profiles and os.path.isdir(profiles_dir):
-        for item in os.listdir(profiles_dir):
+    if not profiles:
+        try:
+            items = os.listdir(profiles_dir)
+        except FileNotFoundError:
+            _MISSING_DATA_DIRS.add(profiles_dir)
+            items = []
+        except OSError:
+            items = []
+        for item in items:
             full = os.path.join(profiles_dir, item)
             if os.path.isdir(full):
                 profiles.append((item, full))
@@ -271,7 +402,36 @@ def _list_firefox_profiles(profiles_dir: str) -> List[Tuple[str, str]]:
 # API pública: listar e obter perfis
 # ---------------------------------------------------------------------------
 
-def list_profiles(browser: str) -> List[BrowserProfile]:
+def iter_profiles(
+    browser: str, read_names: bool = True, first_only: bool = False
+) -> Iterator[BrowserProfile]:
+    """
+    Gera os perfis disponíveis para o navegador especificado, um de cada vez.
+
+    Quem procura um perfil pode parar no primeiro que servir, sem construir
+    os demais. Os parâmetros são os mesmos de list_profiles().
+    """
+    browser = browser.lower()
+    executable = find_browser_executable(browser)
+
+    # Os helpers já tratam diretórios inexistentes (retornam lista vazia e os
+    # registram em _MISSING_DATA_DIRS, pulados nas próximas chamadas)
+    for user_data_dir in _get_user_data_dirs(browser):
+        if user_data_dir in _MISSING_DATA_DIRS:
+            continue
+        if browser == "firefox":
+            entries = _list_firefox_profiles(user_data_dir)
+        else:
+            entries = _list_chromium_profiles(user_data_dir, read_names)
+        # Firefox: (nome, caminho_absoluto); Chromium: (nome, diretório)
+        # Construção posicional, na ordem dos campos de BrowserProfile
+        for name, profile_dir in entries:
+            yield BrowserProfile(browser, name, profile_dir, user_data_dir, executable)
+        if first_only and entries:
+            return
+
+
+def list_profiles(browser: str, read_names: bool = True, first_only: bool = False) -> List[BrowserProfile]:
     """
     Lista todos os perfis disponíveis para o navegador especificado.
 
@@ -279,40 +439,19 @@ def list_profiles(browser: str) -> List[BrowserProfile]:
     ----------
     browser : str
         "chrome", "edge", "firefox" ou "chromium".
+    read_names : bool
+        Se False, perfis Chromium usam o nome do diretório como nome amigável,
+        sem ler Local State/Preferences (padrão: True).
+    first_only : bool
+        Se True, para no primeiro diretório de dados que tiver perfis em vez
+        de varrer todos os candidatos (padrão: False).
 
     Retorna
     -------
     List[BrowserProfile]
         Lista de perfis encontrados no sistema.
     """
-    browser = browser.lower()
-    executable = find_browser_executable(browser)
-    result: List[BrowserProfile] = []
-
-    for user_data_dir in _get_user_data_dirs(browser):
-        if not os.path.isdir(user_data_dir):
-            continue
-
-        if browser == "firefox":
-            for name, abs_path in _list_firefox_profiles(user_data_dir):
-                result.append(BrowserProfile(
-                    browser=browser,
-                    profile_name=name,
-                    profile_dir=abs_path,
-                    user_data_dir=user_data_dir,
-                    executable=executable,
-                ))
-        else:
-            for name, dir_name in _list_chromium_profiles(user_data_dir):
-                result.append(BrowserProfile(
-                    browser=browser,
-                    profile_name=name,
-                    profile_dir=dir_name,
-                    user_data_dir=user_data_dir,
-                    executable=executable,
-                ))
-
-    return result
+    return list(iter_profiles(browser, read_names, first_only))
 
 
 def get_profile(browser: str, profile_name: Optional[str] = None) -> Optional[BrowserProfile]:
@@ -331,28 +470,35 @@ def get_profile(browser: str, profile_name: Optional[str] = None) -> Optional[Br
     -------
     BrowserProfile ou None
     """
-    profiles = list_profiles(browser)
-    if not profiles:
-        return None
-
     if profile_name is None:
-        # Prefere o perfil "Default" ou o primeiro disponível
-        for p in profiles:
+        # A escolha é pelo diretório: os nomes amigáveis não são necessários
+        # para decidir, então só o do perfil escolhido é lido
+        chosen: Optional[BrowserProfile] = None
+        for p in iter_profiles(browser, read_names=False, first_only=True):
+            # Prefere o perfil "Default" ou o primeiro disponível
             if p.profile_dir.lower() in ("default", "default user"):
-                return p
-        return profiles[0]
-
-    # Busca por nome exato (case-insensitive)
-    for p in profiles:
-        if p.profile_name.lower() == profile_name.lower():
-            return p
-
-    # Busca parcial
-    for p in profiles:
-        if profile_name.lower() in p.profile_name.lower():
+                chosen = p
+                break
+            if chosen is None:
+                chosen = p
+        if chosen is not None and chosen.browser != "firefox":
+            name = _chromium_profile_name(chosen.user_data_dir, chosen.profile_dir)
+            if name and name != chosen.profile_name:
+                chosen = dataclasses.replace(chosen, profile_name=name)
+        return chosen
+
+    # Nome exato (case-insensitive) encerra a busca; senão vale a primeira
+    # correspondência parcial
+    wanted = profile_name.lower()
+    partial: Optional[BrowserProfile] = None
+    for p in iter_profiles(browser):
+        name = p.profile_name.lower()
+        if name == wanted:
             return p
+        if partial is None and wanted in name:
+            partial = p
 
-    return None
+    return partial
 
 
 def detect_available_browsers() -> Dict[str, Optional[str]]:
@@ -364,15 +510,17 @@ def detect_available_browsers() -> Dict[str, Optional[str]]:
     Dict[str, Optional[str]]
         Dicionário {nome_navegador: caminho_executável_ou_None}.
     """
-    browsers = ["chrome", "edge", "firefox", "chromium"]
-    return {b: find_browser_executable(b) for b in browsers}
+    # As sondagens são stats no disco (liberam o GIL): em threads, o tempo
+    # total fica perto do navegador mais lento, e não da soma dos quatro
+    with ThreadPoolExecutor(max_workers=len(_BROWSERS)) as pool:
+        return dict(zip(_BROWSERS, pool.map(find_browser_executable, _BROWSERS)))
 
 
 # ---------------------------------------------------------------------------
 # Integração com Playwright: construção dos kwargs de contexto/lançamento
 # ---------------------------------------------------------------------------
 
-def build_playwright_launch_kwargs(profile: Optional[BrowserProfile], headless: bool) -> Dict[str, Any]:
+def build_playwright_launch_kwargs(profile: Optional[BrowserProfile], headless: bool = True) -> Dict[str, Any]:
     """
     Constrói os argumentos necessários para lançar o Playwright com um perfil
     existente do navegador, reutilizando cookies e sessões salvas.
@@ -381,6 +529,8 @@ def build_playwright_launch_kwargs(profile: Optional[BrowserProfile], headless:
     ----------
     profile : BrowserProfile
         Perfil detectado pelo módulo.
+    headless : bool
+        Usado apenas sem perfil (padrão: True).
 
     Retorna
     -------
@@ -430,11 +580,12 @@ def build_playwright_launch_kwargs(profile: Optional[BrowserProfile], headless:
 def print_available_profiles():
     """Imprime no terminal todos os perfis detectados no sistema (útil para debug)."""
     available = detect_available_browsers()
+    with ThreadPoolExecutor(max_workers=len(_BROWSERS)) as pool:
+        all_profiles = list(pool.map(list_profiles, available))
     print("\n=== Navegadores e Perfis Detectados ===")
-    for browser, exe in available.items():
+    for (browser, exe), profiles in zip(available.items(), all_profiles):
         status = exe if exe else "NÃO ENCONTRADO"
         print(f"\n[{browser.upper()}] {status}")
-        profiles = list_profiles(browser)
         if profiles:
             for p in profiles:
                 print(f"  - Perfil: '{p.profile_name}' | Dir: {p.profile_dir}")
@@ -16,19 +16,26 @@ Melhorias em relação à versão anterior:
 """
 
 import asyncio
+import csv
+import hashlib
+import ipaddress
 import json
 import os
 import re
+import socket
+import time
 import urllib.parse
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set
 
-import validators
 from crawl4ai import AsyncWebCrawler as Crawl4AI
 from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
+    Playwright,
     Request,
+    Route,
     async_playwright,
 )
 
@@ -38,7 +45,205 @@ from allfinder.core.browser_profile import (
     detect_available_browsers,
     get_profile,
 )
-from allfinder.core.network_capture import NetworkCapture, DRMInfo
+from allfinder.core.network_capture import (
+    NetworkCapture,
+    DRMInfo,
+    ROUTE_FILTER_RE,
+    should_block_request,
+)
+
+# orjson é opcional: acelera a leitura de arquivos de cookies .json grandes.
+# Sem ele, usa o json da biblioteca padrão.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# Navegadores aceitos pela CLI mapeados para (tipo do Playwright, canal).
+# Chrome e Edge rodam sobre o Chromium do Playwright através de um canal.
+_BROWSER_TYPES: Dict[str, tuple] = {
+    "chromium": ("chromium", None),
+    "chrome": ("chromium", "chrome"),
+    "edge": ("chromium", "msedge"),
+    "firefox": ("firefox", None),
+}
+
+
+# Flags que desligam subsistemas do Chromium sem uso na extração. Aplicadas
+# apenas ao navegador lançado sem perfil (o perfil do usuário fica intacto).
+_CHROMIUM_LAUNCH_ARGS: List[str] = [
+    "--disable-blink-features=AutomationControlled",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Com block_resources, o Blink nem chega a pedir as imagens: evita a ida e
+# volta ao page.route para cada uma. O poster e as meta tags seguem no DOM.
+_CHROMIUM_NO_IMAGES_ARG = "--blink-settings=imagesEnabled=false"
+
+# Opções dos contextos de extração. Service workers são bloqueados porque as
+# requisições feitas por eles escapam do page.route e do listener de rede.
+_CONTEXT_OPTIONS: Dict[str, Any] = {
+    "viewport": {"width": 1280, "height": 720},
+    "service_workers": "block",
+}
+
+
+# Script de metadados (título e thumbnail) avaliado na página ao fim da espera.
+_METADATA_JS = """() => {
+    // Uma única varredura das meta tags, indexadas por property/name
+    const metas = new Map();
+    for (const el of document.querySelectorAll('meta[property], meta[name]')) {
+        for (const attr of ['property', 'name']) {
+            const key = el.getAttribute(attr);
+            if (key && !metas.has(key)) metas.set(key, el.getAttribute('content'));
+        }
+    }
+    const getMeta = (name) => metas.get(name) || metas.get('og:' + name) || null;
+    const titleSelectors = [
+        'h1.video-title', 'h1.LiveVideo__Title', 'h1.video-info__title',
+        '.VideoInfo__Title', '.video-title-container h1', '.headline', 'h1'
+    ];
+    let foundTitle = null;
+    for (const sel of titleSelectors) {
+        const el = document.querySelector(sel);
+        if (el && el.innerText.trim().length > 5) {
+            foundTitle = el.innerText.trim();
+            break;
+        }
+    }
+    const metaTitle = getMeta('title') || getMeta('twitter:title');
+    const video = document.querySelector('video');
+    return {
+        title: foundTitle || metaTitle || document.title,
+        og_image: getMeta('og:image'),
+        twitter_image: getMeta('twitter:image'),
+        poster: video ? video.getAttribute('poster') : null
+    };
+}"""
+
+
+# Padrões de DRM. _KID_RE é testado em toda requisição da página, por isso
+# os três são compilados uma única vez.
+_WIDEVINE_PSSH_RE = re.compile(b"\\x08\\x01\\x12\\x10(.{16})")
+_PLAYREADY_CHALLENGE_RE = re.compile(b"<Challenge>(.*?)</Challenge>")
+_KID_RE = re.compile(r"kid=([0-9a-fA-F]{32})")
+
+
+# Caracteres trocados por "_" no nome do arquivo de sessão de cada host
+_UNSAFE_FILENAME_RE = re.compile(r"[^a-z0-9.-]")
+
+
+# Segundos extras aguardados por uma playlist principal quando o primeiro
+# stream capturado é apenas uma variante ou segmento.
+_MAIN_PLAYLIST_GRACE = 3.0
+
+
+# Caracteres possíveis em um IPv4 numérico fora da forma a.b.c.d: decimal,
+# octal ("0177.1") ou hexadecimal ("0x7f000001"), com 1 a 4 partes
+_NUMERIC_HOST_CHARS = frozenset("0123456789abcdefx.")
+
+
+def _numeric_ipv4(host: str) -> Optional[ipaddress.IPv4Address]:
+    """
+    Interpreta o host como o Chromium interpreta um IPv4 numérico ("127.1",
+    "2130706433", "0x7f000001", "0"), normalizando via inet_aton. Retorna
+    None se o host não for um IPv4 nessa notação.
+    """
+    if not host or not host[0].isdigit() or not _NUMERIC_HOST_CHARS.issuperset(host):
+        return None
+    try:
+        return ipaddress.IPv4Address(socket.inet_aton(host))
+    except OSError:
+        return None
+
+
+def _http_host(url: str) -> Optional[str]:
+    """
+    Retorna o host (em minúsculas) de uma URL http(s) bem formada, ou None.
+
+    Um único urlsplit (esquema, host, sem espaços) substitui a regex genérica
+    do pacote validators, que cobria casos que nunca chegam ao navegador.
+    Como o validators, recusa IPv4 fora da forma a.b.c.d ("127.1",
+    "0x7f000001"): o navegador os aceita, mas nenhuma URL legítima os usa.
+    """
+    if not url or any(c in url for c in " \t\r\n"):
+        return None
+    try:
+        parts = urllib.parse.urlsplit(url)
+        host = parts.hostname
+    except ValueError:
+        return None
+    if parts.scheme not in ("http", "https") or not host:
+        return None
+    numeric = _numeric_ipv4(host)
+    if numeric is not None and str(numeric) != host:
+        return None
+    return host
+
+
+def _is_private_host(host: str) -> bool:
+    """
+    Indica se o host (já em minúsculas, como em urlsplit().hostname) aponta
+    para a própria máquina ou para a rede local. Nomes são comparados por
+    inteiro, e IPs são classificados pelo módulo ipaddress, em vez de uma
+    busca de substrings que também barrava hosts como "cdn10.exemplo.com".
+    """
+    # "localhost." é o mesmo host que "localhost" para o resolvedor
+    host = host.rstrip(".")
+    if host == "localhost" or host.endswith(".localhost"):
+        return True
+    # Só IPs literais (IPv4 começa com dígito; IPv6 tem ":") vão ao ipaddress
+    if not host or not (host[0].isdigit() or ":" in host):
+        return False
+    try:
+        ip = ipaddress.ip_address(host)
+    except ValueError:
+        # IPv4 em notação curta, decimal, octal ou hexadecimal
+        ip = _numeric_ipv4(host)
+        if ip is None:
+            return False
+    return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_unspecified
+
+
+_VALID_SAMESITE = ("Strict", "Lax", "None")
+
+
+def _clean_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """Remove sameSite inválido e normaliza os campos booleanos de um cookie."""
+    if "sameSite" in cookie and cookie["sameSite"] not in _VALID_SAMESITE:
+        del cookie["sameSite"]
+    for bool_field in ("httpOnly", "secure", "session"):
+        if bool_field in cookie:
+            cookie[bool_field] = str(cookie[bool_field]).lower() == "true"
+    return cookie
+
+
+# ---------------------------------------------------------------------------
+# Estado de uma extração
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _ExtractionState:
+    """
+    Estado mutável de uma única chamada a extract().
+
+    Fica fora do M3U8Extractor para que a mesma instância possa ser usada por
+    várias extrações simultâneas sem que uma contamine os resultados da outra.
+    """
+    capture: NetworkCapture = field(
+        default_factory=lambda: NetworkCapture(deduplicate=True, normalize=True)
+    )
+    page_title: str = "Stream"
+    thumbnail_url: Optional[str] = None
+    # Sinalizado pelo handler de requisições assim que um stream é capturado
+    stream_found: asyncio.Event = field(default_factory=asyncio.Event)
+    # Sinalizado quando o stream capturado é uma playlist principal
+    main_found: asyncio.Event = field(default_factory=asyncio.Event)
 
 
 # ---------------------------------------------------------------------------
@@ -68,6 +273,33 @@ class M3U8Extractor:
     use_profile : bool
         Se True, reutiliza um perfil existente do navegador para acessar sites
         que exigem login sem precisar autenticar novamente.
+    block_resources : bool
+        Se True (padrão), aborta imagens, fontes, CSS e rastreadores antes de
+        serem baixados, acelerando o carregamento da página. Como usa
+        page.route, o cache HTTP do navegador fica desativado na página.
+    cdp_url : str, opcional
+        Endpoint CDP de um Chromium já em execução (ex: "http://localhost:9222"
+        ou "ws://..."). Quando informado, nenhum navegador local é lançado e
+        as opções de perfil são ignoradas.
+    session_dir : str, opcional
+        Diretório onde a sessão (cookies e localStorage) de cada host é salva
+        após uma extração bem-sucedida e recarregada nas seguintes, poupando
+        redirecionamentos de login e consentimento. Não se aplica a perfis,
+        que já guardam a própria sessão.
+    cache_dir : str, opcional
+        Diretório do cache de resultados em disco. Usado junto com cache_ttl.
+    cache_ttl : float
+        Por quantos segundos um resultado com streams é reaproveitado para a
+        mesma URL sem abrir o navegador. 0 (padrão) desativa o cache.
+    max_pages : int, opcional
+        Máximo de páginas abertas ao mesmo tempo; extrações além disso
+        aguardam uma vaga. Resultados em cache e chamadas repetidas para uma
+        URL em andamento não ocupam vaga. None (padrão) não limita.
+
+    O navegador é lançado uma única vez em start() e compartilhado por todas
+    as chamadas a extract(); cada extração usa um contexto (ou, com perfil,
+    uma aba) próprio. Sem start(), extract() lança e encerra um navegador
+    apenas para aquela chamada.
     """
 
     def __init__(
@@ -79,6 +311,12 @@ class M3U8Extractor:
         browser: str = "chromium",
         profile_name: Optional[str] = None,
         use_profile: bool = False,
+        block_resources: bool = True,
+        cdp_url: Optional[str] = None,
+        session_dir: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+        cache_ttl: float = 0,
+        max_pages: Optional[int] = None,
     ):
         self.headless = headless
         self.timeout = timeout
@@ -87,34 +325,49 @@ class M3U8Extractor:
         self.browser_name = browser.lower()
         self.profile_name = profile_name
         self.use_profile = use_profile
-
-        # Estado interno (mantido para compatibilidade com plugins existentes)
-        self.found_urls: List[str] = []
-        self.thumbnail_url: Optional[str] = None
-        self.page_title: str = "Stream"
-
-        # Captura de rede aprimorada
-        self._capture = NetworkCapture(deduplicate=True, normalize=True)
+        self.block_resources = block_resources
+        self.cdp_url = cdp_url
+        self.session_dir = session_dir
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.max_pages = max_pages
 
         # Perfil detectado (preenchido em _resolve_profile)
         self._profile: Optional[BrowserProfile] = None
 
+        # Cookies do arquivo, lidos uma única vez em uma thread (preenchido
+        # em _collect_cookies; as extrações simultâneas aguardam a mesma leitura)
+        self._file_cookies: Optional["asyncio.Future[List[Dict[str, Any]]]"] = None
+
+        # Navegador compartilhado (preenchido em start)
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._persistent_context: Optional[BrowserContext] = None
+
+        # Uso avulso (extract() sem start()): as chamadas simultâneas dividem
+        # um navegador, lançado pela primeira e encerrado pela última
+        self._adhoc_users = 0
+        self._adhoc_lock: Optional[asyncio.Lock] = None
+
+        # Crawler do fallback, criado no primeiro uso e mantido até close()
+        self._crawler: Optional[Crawl4AI] = None
+        self._crawler_lock: Optional[asyncio.Lock] = None
+
+        # Limite de páginas abertas (criado no primeiro uso, dentro do loop)
+        self._page_slots: Optional[asyncio.Semaphore] = None
+
+        # Extrações em andamento por URL: chamadas simultâneas para a mesma
+        # URL aguardam a primeira em vez de abrir outra página
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
     # -----------------------------------------------------------------------
     # Validação de URL
     # -----------------------------------------------------------------------
 
     def validate_url(self, url: str) -> bool:
         """Valida se a URL é segura e bem formatada."""
-        if not validators.url(url):
-            return False
-        if not url.lower().startswith(("http://", "https://")):
-            return False
-        parsed_url = re.search(r"https?://([^/]+)", url)
-        if parsed_url:
-            host = parsed_url.group(1).lower()
-            if any(x in host for x in ["localhost", "127.0.0.1", "0.0.0.0", "192.168.", "10.", "172.16."]):
-                return False
-        return True
+        host = _http_host(url)
+        return host is not None and not _is_private_host(host)
 
     # -----------------------------------------------------------------------
     # Resolução de perfil de navegador
@@ -144,45 +397,48 @@ class M3U8Extractor:
 
     def _parse_cookies_file(self) -> List[Dict[str, Any]]:
         """Lê cookies de arquivos .json ou .txt (formato Netscape) e limpa campos inválidos."""
-        if not self.cookies_file or not os.path.exists(self.cookies_file):
+        if not self.cookies_file:
             return []
-        cookies = []
+        # Abre direto e trata a ausência, em vez de um os.path.exists antes
         try:
             if self.cookies_file.endswith(".json"):
-                with open(self.cookies_file, "r") as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        cookies = data
-                    elif isinstance(data, dict) and "cookies" in data:
-                        cookies = data["cookies"]
-            else:
-                with open(self.cookies_file, "r") as f:
-                    for line in f:
-                        if line.startswith("#") or not line.strip():
-                            continue
-                        parts = line.strip().split("\t")
-                        if len(parts) >= 7:
-                            cookies.append({
-                                "name": parts[5],
-                                "value": parts[6],
-                                "domain": parts[0],
-                                "path": parts[2],
-                                "expires": int(parts[4]) if parts[4].isdigit() else -1,
-                                "httpOnly": parts[1].upper() == "TRUE",
-                                "secure": parts[3].upper() == "TRUE",
-                            })
-
-            cleaned: List[Dict[str, Any]] = []
-            valid_samesite = ["Strict", "Lax", "None"]
-            for cookie in cookies:
-                if "sameSite" in cookie and cookie["sameSite"] not in valid_samesite:
-                    del cookie["sameSite"]
-                for bool_field in ["httpOnly", "secure", "session"]:
-                    if bool_field in cookie:
-                        cookie[bool_field] = str(cookie[bool_field]).lower() == "true"
-                cleaned.append(cookie)
-            return cleaned
+                with open(self.cookies_file, "rb") as f:
+                    data = _json_loads(f.read())
+                if isinstance(data, list):
+                    cookies = data
+                elif isinstance(data, dict) and "cookies" in data:
+                    cookies = data["cookies"]
+                else:
+                    return []
+                return [_clean_cookie(cookie) for cookie in cookies]
 
+            # Netscape: a tokenização por tabulação fica com o csv (em C); os
+            # campos booleanos saem como bool e não há sameSite a validar.
+            # errors="replace" evita que um byte inválido descarte o arquivo todo
+            cookies: List[Dict[str, Any]] = []
+            with open(self.cookies_file, "r", encoding="utf-8", errors="replace",
+                      newline="", buffering=1 << 16) as f:
+                lines = (line for line in f if line[:1] != "#")
+                for parts in csv.reader(lines, delimiter="\t", quoting=csv.QUOTE_NONE):
+                    if len(parts) < 7:
+                        continue
+                    try:
+                        expires = int(parts[4])
+                    except ValueError:
+                        expires = -1
+                    cookies.append({
+                        "name": parts[5],
+                        "value": parts[6],
+                        "domain": parts[0],
+                        "path": parts[2],
+                        "expires": expires,
+                        "httpOnly": parts[1].upper() == "TRUE",
+                        "secure": parts[3].upper() == "TRUE",
+                    })
+            return cookies
+
+        except FileNotFoundError:
+            return []
         except Exception as e:
             print(f"[!] Erro ao ler/limpar arquivo de cookies: {e}")
         return []
@@ -210,63 +466,193 @@ class M3U8Extractor:
     # Handler de requisições (mantido para compatibilidade com plugins)
     # -----------------------------------------------------------------------
 
-    async def _handle_request(self, request: Request):
-        """Callback legado para o evento \'request\'. Delega para o NetworkCapture."""
-        self._capture._process_url(request.url)
-        self.found_urls = self._capture.get_urls()
-        await self._handle_drm_request(request)
+    def _handle_request(self, request: Request, state: _ExtractionState):
+        """
+        Processa uma requisição da página. Delega para o NetworkCapture.
+
+        É síncrono de propósito: o evento dispara para cada sub-recurso da
+        página, e um handler assíncrono criaria uma Task por requisição.
+        Capturada uma playlist principal, a captura de streams é pulada (os
+        segmentos que o player continua pedindo não acrescentam nada), mas o
+        listener segue ativo: licenças DRM e URLs com kid= costumam chegar
+        depois do master.
+        """
+        # Os eventos só mudam quando um stream novo entra na captura; nas
+        # demais requisições não há o que reavaliar
+        if not state.main_found.is_set() and state.capture._process_url(request.url):
+            state.stream_found.set()
+            if state.capture.has_priority_stream():
+                state.main_found.set()
+        self._handle_drm_request(request, state)
+
+    # -----------------------------------------------------------------------
+    # Espera pelo stream
+    # -----------------------------------------------------------------------
+
+    async def _wait_for_stream(self, page: Page, state: _ExtractionState):
+        """
+        Aguarda, sem polling, o que acontecer primeiro: a captura de um stream,
+        o fechamento ou travamento da página, ou o fim do tempo limite.
+
+        Se o primeiro stream não for uma playlist principal (ex: uma variante
+        pedida antes do master), espera mais _MAIN_PLAYLIST_GRACE segundos por
+        ela; se a principal chega primeiro, retorna na hora.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout / 1000
+        page_gone = loop.create_future()
+
+        def on_page_gone(_):
+            if not page_gone.done():
+                page_gone.set_result(None)
+
+        async def wait_for(event: asyncio.Event, timeout: float):
+            waiter = asyncio.ensure_future(event.wait())
+            try:
+                await asyncio.wait(
+                    {waiter, page_gone},
+                    timeout=max(0.0, timeout),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                waiter.cancel()
+
+        page.once("close", on_page_gone)
+        page.once("crash", on_page_gone)
+        try:
+            await wait_for(state.stream_found, deadline - loop.time())
+            if state.stream_found.is_set() and not page_gone.done():
+                grace = min(_MAIN_PLAYLIST_GRACE, deadline - loop.time())
+                await wait_for(state.main_found, grace)
+        finally:
+            page_gone.cancel()
+            page.remove_listener("close", on_page_gone)
+            page.remove_listener("crash", on_page_gone)
+
+    # -----------------------------------------------------------------------
+    # Bloqueio de recursos na camada de rede
+    # -----------------------------------------------------------------------
+
+    async def _route_filter(self, route: Route):
+        """Aborta recursos que não ajudam a encontrar streams; o resto segue."""
+        request = route.request
+        if should_block_request(request.url, request.resource_type):
+            await route.abort()
+        else:
+            await route.continue_()
 
     # -----------------------------------------------------------------------
     # Extração de metadados da página
     # -----------------------------------------------------------------------
 
-    async def _update_metadata(self, page: Page):
+    async def _update_metadata(self, page: Page, state: _ExtractionState):
         """Extrai título e thumbnail da página via JavaScript injetado."""
         try:
-            metadata = await page.evaluate("""() => {
-                const getMeta = (name) => {
-                    const el = document.querySelector(
-                        `meta[property="${name}"], meta[name="${name}"],
-                         meta[property="og:${name}"], meta[name="${name}"]`
-                    );
-                    return el ? el.getAttribute(\'content\') : null;
-                };
-                const titleSelectors = [
-                    \'h1.video-title\', \'h1.LiveVideo__Title\', \'h1.video-info__title\',
-                    \'.VideoInfo__Title\', \'.video-title-container h1\', \'.headline\', \'h1\'
-                ];
-                let foundTitle = null;
-                for (const sel of titleSelectors) {
-                    const el = document.querySelector(sel);
-                    if (el && el.innerText.trim().length > 5) {
-                        foundTitle = el.innerText.trim();
-                    }
-                }
-                const metaTitle = getMeta(\'title\') || getMeta(\'og:title\') || getMeta(\'twitter:title\');
-                return {
-                    title: foundTitle || metaTitle || document.title,
-                    og_image: getMeta(\'og:image\'),
-                    twitter_image: getMeta(\'twitter:image\'),
-                    poster: document.querySelector(\'video\')
-                        ? document.querySelector(\'video\').getAttribute(\'poster\')
-                        : null
-                };
-            }""")
+            metadata = await page.evaluate(_METADATA_JS)
 
             if metadata:
                 if metadata.get("title"):
-                    self.page_title = metadata["title"].strip()
+                    state.page_title = metadata["title"].strip()
                 thumbnail = (
                     metadata.get("og_image")
                     or metadata.get("twitter_image")
                     or metadata.get("poster")
                 )
-                if thumbnail and validators.url(thumbnail):
-                    self.thumbnail_url = thumbnail
+                if thumbnail and _http_host(thumbnail):
+                    state.thumbnail_url = thumbnail
 
         except Exception as e:
             print(f"\n[!] Erro ao extrair metadados: {e}")
 
+    # -----------------------------------------------------------------------
+    # Ciclo de vida do navegador compartilhado
+    # -----------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """
+        Inicia o Playwright e lança o navegador compartilhado pelas extrações.
+        Com use_profile=True, abre um contexto persistente sobre o perfil; com
+        cdp_url, conecta-se a um Chromium já em execução em vez de lançar um.
+        """
+        if self._playwright:
+            return
+
+        self._profile = None if self.cdp_url else self._resolve_profile()
+        self._playwright = await async_playwright().start()
+        try:
+            if self.cdp_url:
+                print(f"[*] Conectando ao navegador remoto: {self.cdp_url}")
+                self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+            elif self._profile:
+                self._persistent_context = await self._launch_persistent_context()
+            else:
+                browser_type, channel = _BROWSER_TYPES.get(self.browser_name, ("chromium", None))
+                launch_kwargs = build_playwright_launch_kwargs(None, self.headless)
+                if channel:
+                    launch_kwargs["channel"] = channel
+                if browser_type == "chromium":
+                    launch_kwargs["args"] = list(_CHROMIUM_LAUNCH_ARGS)
+                    if self.block_resources:
+                        launch_kwargs["args"].append(_CHROMIUM_NO_IMAGES_ARG)
+                self._browser = await self._playwright[browser_type].launch(**launch_kwargs)
+        except Exception:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        """Encerra o navegador compartilhado, o crawler do fallback e o Playwright."""
+        if self._crawler:
+            try:
+                await self._crawler.close()
+            except Exception as e:
+                print(f"[!] Erro ao encerrar o Crawl4AI: {e}")
+            self._crawler = None
+        if self._persistent_context:
+            await self._persistent_context.close()
+            self._persistent_context = None
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "M3U8Extractor":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _launch_persistent_context(self) -> BrowserContext:
+        """Lança o navegador reutilizando o diretório de dados do perfil."""
+        launch_kwargs = build_playwright_launch_kwargs(self._profile, self.headless)
+        browser_type = self._playwright[launch_kwargs["browser_type"]]
+        args = list(launch_kwargs["args"])
+
+        if launch_kwargs["browser_type"] == "firefox":
+            # No Firefox, profile_dir já é o caminho absoluto do perfil
+            user_data_dir = self._profile.profile_dir
+        else:
+            user_data_dir = launch_kwargs["user_data_dir"]
+            args.append(f"--profile-directory={launch_kwargs['profile_directory']}")
+
+        options: Dict[str, Any] = {"headless": self.headless, "args": args, **_CONTEXT_OPTIONS}
+        if launch_kwargs["channel"]:
+            options["channel"] = launch_kwargs["channel"]
+        elif launch_kwargs["executable_path"]:
+            options["executable_path"] = launch_kwargs["executable_path"]
+
+        try:
+            return await browser_type.launch_persistent_context(user_data_dir, **options)
+        except Exception:
+            if not (options.get("channel") and self._profile.executable):
+                raise
+            print("[!] Tentando lançar navegador a partir do executável do perfil...")
+            options.pop("channel")
+            options["executable_path"] = self._profile.executable
+            return await browser_type.launch_persistent_context(user_data_dir, **options)
+
     # -----------------------------------------------------------------------
     # Lógica principal de extração
     # -----------------------------------------------------------------------
@@ -276,6 +662,8 @@ class M3U8Extractor:
         Executa a extração de mídia para uma única URL.
 
         Retorna um dicionário com as URLs encontradas, título e thumbnail.
+        Se a mesma URL já estiver sendo extraída, aguarda e devolve o mesmo
+        resultado em vez de navegar de novo.
         """
         if not self.validate_url(url):
             return {
@@ -285,85 +673,221 @@ class M3U8Extractor:
                 "drm_info": None,
             }
 
-        self._profile = self._resolve_profile()
+        pending = self._inflight.get(url)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        task = asyncio.ensure_future(self._run_extraction(url, plugin))
+        self._inflight[url] = task
+
+        def forget(done):
+            # Sucesso ou erro, a próxima chamada para a URL extrai de novo
+            if self._inflight.get(url) is done:
+                del self._inflight[url]
+
+        task.add_done_callback(forget)
+        # shield para todos, inclusive quem iniciou: cancelar um chamador
+        # (ex: cliente HTTP que desconectou) não derruba a extração dos demais
+        return await asyncio.shield(task)
 
-        if self._profile:
-            launch_kwargs = build_playwright_launch_kwargs(self._profile, self.headless)
+    async def _run_extraction(self, url: str, plugin: Any) -> Dict[str, Any]:
+        """
+        Extrai a URL passando antes pelo cache de resultados (se ativado) e
+        respeitando o limite de páginas abertas (max_pages).
+        """
+        cached = self._load_cached_result(url)
+        if cached is not None:
+            print(f"[*] Usando resultado em cache para: {url}")
+            return cached
+
+        if self.max_pages:
+            if self._page_slots is None:
+                self._page_slots = asyncio.Semaphore(self.max_pages)
+            async with self._page_slots:
+                result = await self._open_and_extract(url, plugin)
         else:
-            launch_kwargs = build_playwright_launch_kwargs(None, self.headless)
+            result = await self._open_and_extract(url, plugin)
 
-        async with async_playwright() as p:
-            browser_instance = p[self.browser_name]
-            try:
-                browser = await browser_instance.launch(**launch_kwargs)
-            except Exception as e:
-                if "looks like you are trying to access a browser that is not owned by this Playwright instance" in str(e):
-                    print("[!] Tentando lançar navegador a partir do executável do perfil...")
-                    if self._profile and self._profile.executable_path:
-                        launch_kwargs["executable_path"] = self._profile.executable_path
-                        browser = await browser_instance.launch(**launch_kwargs)
-                    else:
-                        raise e
-                else:
-                    raise e
+        if result["urls"] or result["drm_info"]:
+            self._store_result(url, result)
+        return result
 
-            context = await self._create_browser_context(browser)
-            page = await context.new_page()
+    async def _open_and_extract(self, url: str, plugin: Any) -> Dict[str, Any]:
+        """Extrai a URL no navegador compartilhado ou, sem start(), em um avulso."""
+        if self._playwright and not self._adhoc_users:
+            return await self._extract_page(url, plugin)
 
-            # Mascaramento de automação
-            await page.add_init_script(
-                """Object.defineProperty(navigator, "webdriver", {get: () => undefined});"""
-            )
+        # Uso avulso (sem start()): o navegador vive enquanto houver chamadas.
+        # A contagem sobe antes do start(), então uma chamada concorrente
+        # nunca usa o navegador sem ser contada e nunca lança um segundo
+        if self._adhoc_lock is None:
+            self._adhoc_lock = asyncio.Lock()
+        async with self._adhoc_lock:
+            self._adhoc_users += 1
+            if self._adhoc_users == 1:
+                try:
+                    await self.start()
+                except BaseException:
+                    self._adhoc_users -= 1
+                    raise
+        try:
+            return await self._extract_page(url, plugin)
+        finally:
+            async with self._adhoc_lock:
+                self._adhoc_users -= 1
+                if not self._adhoc_users:
+                    await self.close()
 
-            # Captura de rede
-            page.on("request", self._handle_request)
+    # -----------------------------------------------------------------------
+    # Cache de resultados em disco
+    # -----------------------------------------------------------------------
 
-            try:
-                print(f"[*] Navegando para: {url}...")
-                print(f"[*] Timeout configurado para page.goto: {self.timeout}ms")
-                await page.goto(url, timeout=self.timeout)
-                print("[*] Navegação concluída.")
-
-                # Lógica de interação do plugin
-                if plugin and hasattr(plugin, 'interact'):
-                    await plugin.interact(page)
-
-                # Loop de espera e atualização de metadados
-                for _ in range(int(self.timeout / 2000)):
-                    await self._update_metadata(page)
-                    if self._capture.get_urls():
-                        break
-                    await asyncio.sleep(2)
+    def _cache_path(self, url: str) -> Optional[str]:
+        """
+        Caminho do resultado em cache da URL (None se o cache está desativado).
 
-            except Exception as e:
-                print(f"\n[!] Erro durante a navegação/interação: {e}")
-                print("[!] Tentando fallback com Crawl4AI devido a erro na navegação/interação.")
+        A chave inclui as opções que mudam o que a página entrega (navegador,
+        perfil e cookies): um resultado obtido logado não é servido a uma
+        execução sem login, nem o contrário.
+        """
+        if not self.cache_dir or self.cache_ttl <= 0:
+            return None
+        key = "\0".join((
+            url,
+            self.browser_name,
+            str(self.use_profile),
+            self.profile_name or "",
+            str(bool(self.cookies_file or self.cookies_from_browser)),
+        ))
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".json")
 
-            finally:
-                self.found_urls = self._capture.get_urls()
-                drm_info = self._capture.get_drm_info()
+    def _load_cached_result(self, url: str) -> Optional[Dict[str, Any]]:
+        """Retorna o resultado salvo para a URL se ainda estiver dentro do TTL."""
+        cache_path = self._cache_path(url)
+        if not cache_path:
+            return None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if time.time() - entry["saved_at"] > self.cache_ttl or entry["url"] != url:
+                return None
+            result = entry["result"]
+            if result.get("drm_info"):
+                result["drm_info"] = DRMInfo(**result["drm_info"])
+            return result
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[!] Cache ignorado ({cache_path}): {e}")
+            return None
+
+    def _store_result(self, url: str, result: Dict[str, Any]) -> None:
+        """Salva o resultado da URL no cache, se ativado."""
+        cache_path = self._cache_path(url)
+        if not cache_path:
+            return
+        drm_info = result.get("drm_info")
+        entry = {
+            "url": url,
+            "saved_at": time.time(),
+            "result": {**result, "drm_info": asdict(drm_info) if drm_info else None},
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+        except Exception as e:
+            print(f"[!] Erro ao salvar o cache: {e}")
+
+    async def _extract_page(self, url: str, plugin: Any) -> Dict[str, Any]:
+        """Extrai a mídia de uma URL em uma nova aba do navegador compartilhado."""
+        state = _ExtractionState()
+
+        if self._persistent_context:
+            context = self._persistent_context
+            cookies = await self._collect_cookies(url)
+            if cookies:
+                await context.add_cookies(cookies)
+        else:
+            context = await self._create_browser_context(self._browser, url)
+        page = await context.new_page()
+
+        # Rota restrita a imagens, fontes, CSS e hosts de rastreamento: o
+        # driver só encaminha ao Python o que casa com o padrão, e o manifesto
+        # e os segmentos seguem sem ida e volta. Qualquer rota desliga o cache
+        # HTTP da página; como cada extração abre um contexto novo, o cache
+        # quase nunca seria aproveitado.
+        if self.block_resources:
+            await page.route(ROUTE_FILTER_RE, self._route_filter)
+
+        # Mascaramento de automação
+        await page.add_init_script(
+            """Object.defineProperty(navigator, "webdriver", {get: () => undefined});"""
+        )
+
+        # Captura de rede: o handler fecha sobre o estado desta extração. É
+        # uma função simples de propósito: o Playwright chama
+        # inspect.signature() no handler a cada evento, o que custa bem mais
+        # caro para um functools.partial do que para uma função
+        def on_request(request: Request):
+            self._handle_request(request, state)
+
+        page.on("request", on_request)
+
+        try:
+            print(f"[*] Navegando para: {url}...")
+            print(f"[*] Timeout configurado para page.goto: {self.timeout}ms")
+            # Retorna assim que a resposta começa a chegar: a captura de rede já
+            # está ativa e quem precisa do DOM (plugins) espera por conta própria
+            await page.goto(url, wait_until="commit", timeout=self.timeout)
+            print("[*] Navegação iniciada.")
 
-                await browser.close()
+            # Lógica de interação do plugin
+            if plugin and hasattr(plugin, 'interact'):
+                await plugin.interact(page)
+
+            await self._wait_for_stream(page, state)
+            await self._update_metadata(page, state)
+
+        except Exception as e:
+            print(f"\n[!] Erro durante a navegação/interação: {e}")
+            print("[!] Tentando fallback com Crawl4AI devido a erro na navegação/interação.")
+
+        finally:
+            # O navegador é compartilhado: fecha apenas o que esta extração abriu
+            if context is self._persistent_context:
+                await page.close()
+            else:
+                if state.capture.has_streams():
+                    await self._save_session(context, url)
+                await context.close()
+
+        found_urls = state.capture.get_urls()
 
         # Lógica de fallback com Crawl4AI
-        if not self.found_urls and not self._capture.get_drm_info():
+        if not found_urls and not state.capture.get_drm_info():
             crawl4ai_result = await self._run_crawl4ai_fallback(url)
             if crawl4ai_result["urls"]:
-                self.found_urls.extend(crawl4ai_result["urls"])
+                found_urls.extend(crawl4ai_result["urls"])
             if crawl4ai_result["drm_info"]:
-                self._capture._drm_info = crawl4ai_result["drm_info"]
+                state.capture._drm_info = crawl4ai_result["drm_info"]
 
         return {
-            "urls": self.found_urls,
-            "title": self.page_title,
-            "thumbnail": self.thumbnail_url,
-            "drm_info": self._capture.get_drm_info(),
+            "urls": found_urls,
+            "title": state.page_title,
+            "thumbnail": state.thumbnail_url,
+            "drm_info": state.capture.get_drm_info(),
         }
 
-    async def _handle_drm_request(self, request: Request):
+    def _handle_drm_request(self, request: Request, state: _ExtractionState):
         """Processa requisições de DRM para extrair license_url, PSSH e KID."""
+        # Desafios de licença são sempre POST: a URL só é convertida para
+        # minúsculas nesse caso, e não em cada GET da página
+        url_lower = request.url.lower() if request.method == "POST" else ""
+
         # Widevine
-        if "widevine" in request.url and request.method == "POST":
+        if "widevine" in url_lower:
             try:
                 post_data = request.post_data_buffer
                 if post_data:
@@ -372,20 +896,20 @@ class M3U8Extractor:
                         data = json.loads(post_data.decode("utf-8"))
                         if "challenge" in data:
                             # Isso é mais comum para PlayReady, mas alguns Widevine podem usar
-                            self._capture._drm_info = DRMInfo(license_url=request.url, pssh=data.get("pssh"))
+                            state.capture._drm_info = DRMInfo(license_url=request.url, pssh=data.get("pssh"))
                     except json.JSONDecodeError:
                         # Se não for JSON, pode ser o formato binário do Widevine
                         # O PSSH geralmente é encontrado no corpo da requisição
-                        pssh_match = re.search(b"\\x08\\x01\\x12\\x10(.{16})", post_data)
+                        pssh_match = _WIDEVINE_PSSH_RE.search(post_data)
                         if pssh_match:
                             pssh_bytes = pssh_match.group(1)
                             # Converte para base64 se necessário, ou mantém como bytes
-                            self._capture._drm_info = DRMInfo(license_url=request.url, pssh=pssh_bytes.hex())
+                            state.capture._drm_info = DRMInfo(license_url=request.url, pssh=pssh_bytes.hex())
             except Exception as e:
                 print(f"[!] Erro ao processar requisição Widevine: {e}")
 
         # PlayReady
-        elif "playready" in request.url and request.method == "POST":
+        elif "playready" in url_lower:
             try:
                 post_data = request.post_data_buffer
                 if post_data:
@@ -394,24 +918,27 @@ class M3U8Extractor:
                         data = json.loads(post_data.decode("utf-8"))
                         # Lógica para extrair PSSH/KID de JSON PlayReady
                         if "challenge" in data:
-                            self._capture._drm_info = DRMInfo(license_url=request.url, pssh=data.get("pssh"))
+                            state.capture._drm_info = DRMInfo(license_url=request.url, pssh=data.get("pssh"))
                     except json.JSONDecodeError:
                         # Tenta como XML
                         if b"<Challenge>" in post_data:
                             # Lógica para extrair PSSH/KID de XML PlayReady
-                            pssh_match = re.search(b"<Challenge>(.*?)</Challenge>", post_data)
+                            pssh_match = _PLAYREADY_CHALLENGE_RE.search(post_data)
                             if pssh_match:
                                 pssh_base64 = pssh_match.group(1).decode("utf-8")
-                                self._capture._drm_info = DRMInfo(license_url=request.url, pssh=pssh_base64)
+                                state.capture._drm_info = DRMInfo(license_url=request.url, pssh=pssh_base64)
             except Exception as e:
                 print(f"[!] Erro ao processar requisição PlayReady: {e}")
 
-        # Tenta extrair KID de URLs de licença (comum em alguns sistemas)
-        kid_match = re.search(r"kid=([0-9a-fA-F]{32})", request.url)
+        # Tenta extrair KID de URLs de licença (comum em alguns sistemas). O
+        # teste de substring descarta quase todas as requisições sem a regex
+        if "kid=" not in request.url:
+            return
+        kid_match = _KID_RE.search(request.url)
         if kid_match:
-            if not self._capture._drm_info:
-                self._capture._drm_info = DRMInfo()
-            self._capture._drm_info.kid = kid_match.group(1)
+            if not state.capture._drm_info:
+                state.capture._drm_info = DRMInfo()
+            state.capture._drm_info.kid = kid_match.group(1)
 
     async def _run_crawl4ai_fallback(self, url: str) -> Dict[str, Any]:
         """
@@ -420,19 +947,23 @@ class M3U8Extractor:
         """
         print("[!] Captura de rede não encontrou URLs de mídia ou DRM. Tentando Crawl4AI...")
         try:
-            crawl4ai = Crawl4AI()
-            result = await crawl4ai.arun(url=url)
+            crawler = await self._get_crawler()
+            result = await crawler.arun(url=url)
 
-            found_urls = []
+            found_urls: List[str] = []
+            seen_urls: Set[str] = set()
             drm_info = None
 
             if result and result.media:
-                for video in result.media.get("videos", []):
-                    if video.get("src") and (".m3u8" in video.get("src") or ".mpd" in video.get("src")):
-                        found_urls.append(video.get("src"))
-                for audio in result.media.get("audios", []):
-                    if audio.get("src") and (".m3u8" in audio.get("src") or ".mpd" in audio.get("src")):
-                        found_urls.append(audio.get("src"))
+                media_items = result.media.get("videos", []) + result.media.get("audios", [])
+                for item in media_items:
+                    src = item.get("src")
+                    # O mesmo manifesto costuma aparecer em mais de uma tag
+                    if not src or src in seen_urls:
+                        continue
+                    if ".m3u8" in src or ".mpd" in src:
+                        seen_urls.add(src)
+                        found_urls.append(src)
                 if found_urls:
                     print(f"[*] Crawl4AI encontrou {len(found_urls)} URLs de mídia.")
 
@@ -453,45 +984,110 @@ class M3U8Extractor:
             print(f"[!] Erro ao executar Crawl4AI: {e}")
             return {"urls": [], "drm_info": None}
 
-    async def _create_browser_context(self, browser: Browser) -> BrowserContext:
+    async def _get_crawler(self) -> Crawl4AI:
         """
-        Cria um contexto de navegador com cookies e perfil, se aplicável.
+        Retorna o crawler do fallback, iniciando-o no primeiro uso. Ele é
+        compartilhado pelas extrações para não lançar um navegador por URL.
         """
-        context_kwargs = {}
-        if self._profile and self._profile.user_data_dir:
-            # Lança um contexto persistente se um perfil for usado
-            context = await browser.new_context(
-                user_agent=(self._profile.user_agent or None),
-                viewport=self._profile.viewport or None,
-                **context_kwargs
-            )
-        else:
-            # Contexto normal (não persistente)
-            context = await browser.new_context(**context_kwargs)
+        if self._crawler_lock is None:
+            self._crawler_lock = asyncio.Lock()
+        async with self._crawler_lock:
+            if self._crawler is None:
+                crawler = Crawl4AI()
+                await crawler.start()
+                self._crawler = crawler
+        return self._crawler
 
-        # Carrega cookies
-        cookies = self._parse_cookies_file()
-        if self.cookies_from_browser:
+    async def _create_browser_context(self, browser: Browser, url: str) -> BrowserContext:
+        """
+        Cria um contexto de navegador isolado, já com os cookies configurados.
+        """
+        session_path = self._session_path(url)
+        context = None
+        if session_path and os.path.isfile(session_path):
             try:
-                from browser_cookie3 import load
-                domain = urllib.parse.urlparse(self.found_urls[0]).netloc if self.found_urls else ''
-                cj = load(self.cookies_from_browser, domain_name=domain)
-                for cookie in cj:
-                    cookies.append({
-                        "name": cookie.name,
-                        "value": cookie.value,
-                        "domain": cookie.domain,
-                        "path": cookie.path,
-                        "expires": cookie.expires or -1,
-                        "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
-                        "secure": cookie.secure,
-                    })
-            except ImportError:
-                print("[!] Para usar --cookies-from-browser, instale 'browser-cookie3'.")
+                context = await browser.new_context(**_CONTEXT_OPTIONS, storage_state=session_path)
             except Exception as e:
-                print(f"[!] Erro ao carregar cookies do navegador: {e}")
-
+                print(f"[!] Sessão salva ignorada ({session_path}): {e}")
+        if context is None:
+            context = await browser.new_context(**_CONTEXT_OPTIONS)
+        cookies = await self._collect_cookies(url)
         if cookies:
             await context.add_cookies(cookies)
-
         return context
+
+    def _session_path(self, url: str) -> Optional[str]:
+        """Caminho do arquivo de sessão do host da URL (None se desativado)."""
+        if not self.session_dir:
+            return None
+        host = (urllib.parse.urlsplit(url).hostname or "").lower()
+        if not host:
+            return None
+        return os.path.join(self.session_dir, _UNSAFE_FILENAME_RE.sub("_", host) + ".json")
+
+    async def _save_session(self, context: BrowserContext, url: str) -> None:
+        """
+        Salva cookies e localStorage do contexto para as próximas extrações.
+
+        A sessão guarda cookies de login, inclusive os importados do navegador
+        do usuário ou do arquivo de cookies: o diretório é criado com 0o700 e
+        o arquivo com 0o600, legíveis apenas pelo próprio usuário.
+        """
+        session_path = self._session_path(url)
+        if not session_path:
+            return
+        try:
+            state = await context.storage_state()
+            os.makedirs(self.session_dir, mode=0o700, exist_ok=True)
+            os.chmod(self.session_dir, 0o700)
+            fd = os.open(session_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                # O modo de os.open só vale na criação: corrige arquivos antigos
+                os.chmod(session_path, 0o600)
+                json.dump(state, f)
+        except Exception as e:
+            print(f"[!] Erro ao salvar a sessão: {e}")
+
+    async def _collect_cookies(self, url: str) -> List[Dict[str, Any]]:
+        """
+        Reúne os cookies do arquivo e, se configurado, do navegador do usuário.
+        Os cookies do navegador são filtrados pelo domínio da URL de destino.
+        """
+        cookies: List[Dict[str, Any]] = []
+        if self.cookies_file:
+            if self._file_cookies is None:
+                # Arquivos de cookies exportados podem ter milhares de linhas:
+                # a leitura não deve travar as outras extrações do event loop
+                loop = asyncio.get_running_loop()
+                self._file_cookies = loop.run_in_executor(None, self._parse_cookies_file)
+            cookies.extend(await self._file_cookies)
+        if self.cookies_from_browser:
+            # browser_cookie3 lê e descriptografa o banco de cookies do
+            # navegador de forma síncrona; roda em uma thread para não travar
+            # as outras extrações do event loop
+            domain = urllib.parse.urlparse(url).netloc
+            loop = asyncio.get_running_loop()
+            cookies.extend(await loop.run_in_executor(None, self._load_browser_cookies, domain))
+        return cookies
+
+    def _load_browser_cookies(self, domain: str) -> List[Dict[str, Any]]:
+        """Carrega os cookies do domínio a partir do navegador do usuário."""
+        cookies = []
+        try:
+            from browser_cookie3 import load
+            cj = load(self.cookies_from_browser, domain_name=domain)
+            for cookie in cj:
+                cookies.append({
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "expires": cookie.expires or -1,
+                    "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+                    "secure": cookie.secure,
+                })
+        except ImportError:
+            print("[!] Para usar --cookies-from-browser, instale 'browser-cookie3'.")
+        except Exception as e:
+            print(f"[!] Erro ao carregar cookies do navegador: {e}")
+        return cookies
@@ -13,11 +13,13 @@ Funcionalidades:
 - Priorização de playlists principais (master, index, playlist).
 - Suporte a múltiplos formatos: HLS (.m3u8) e MPEG-DASH (.mpd).
 - Extração de URLs embutidas em parâmetros de redirecionamento.
+- Bloqueio de recursos pesados e rastreadores antes de chegarem à rede.
 """
 
 import re
 import urllib.parse
-from typing import List, Optional, Set, Dict
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Pattern, Set, Dict
 from dataclasses import dataclass, field
 
 
@@ -61,6 +63,53 @@ REDIRECT_PARAMS: List[str] = [
 # Extensões de mídia suportadas
 MEDIA_EXTENSIONS: List[str] = [".m3u8", ".mpd"]
 
+# Tipos de recurso do Playwright que não ajudam a encontrar streams e podem ser
+# abortados antes de serem baixados (a thumbnail vem das meta tags da página).
+BLOCKED_RESOURCE_TYPES: Set[str] = {"image", "font", "stylesheet"}
+
+# Hosts de rastreamento e publicidade abortados na camada de rede. É um
+# subconjunto da BLACKLIST_KEYWORDS restrito a domínios de terceiros: termos
+# genéricos como "log." ou "ping" derrubariam recursos legítimos da página.
+BLOCKED_HOST_KEYWORDS: List[str] = [
+    "youbora", "chartbeat", "omtrdc", "hotjar", "scorecardresearch",
+    "mixpanel", "amplitude", "newrelic", "doubleclick", "googleads",
+    "amazon-adsystem", "casalemedia", "adnxs", "moatads", "krxd",
+    "fwmrm.net", "pubmatic", "rubiconproject", "spotxchange",
+    "springserve", "yieldmo", "sharethrough",
+]
+
+# Extensões de imagens, fontes e CSS. Servem para montar o padrão de URL do
+# page.route: o Playwright só repassa ao Python as requisições que casam com
+# ele, então manifestos e segmentos de mídia nem passam pelo filtro.
+BLOCKED_URL_EXTENSIONS: List[str] = [
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+    "woff", "woff2", "ttf", "otf", "eot", "css",
+]
+
+
+def _compile_keywords(keywords: Iterable[str]) -> Pattern:
+    """Compila uma lista de termos em uma única regex (sem diferenciar caixa)."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Versões compiladas das listas acima: uma única busca do motor de regex por
+# URL no lugar de um laço Python com um teste de substring por termo. As
+# regexes são montadas na importação; alterações posteriores nas listas não
+# são refletidas.
+_BLACKLIST_RE = _compile_keywords(BLACKLIST_KEYWORDS)
+_PRIORITY_RE = _compile_keywords(PRIORITY_KEYWORDS)
+_MEDIA_RE = _compile_keywords(MEDIA_EXTENSIONS)
+_BLOCKED_HOST_RE = _compile_keywords(BLOCKED_HOST_KEYWORDS)
+
+# Padrão de URL para o page.route: candidatos a bloqueio por extensão ou por
+# host. A decisão final continua em should_block_request. Sem lookbehind nem
+# grupos nomeados, para valer também como regex JavaScript no driver.
+ROUTE_FILTER_RE = re.compile(
+    r"\.(?:" + "|".join(BLOCKED_URL_EXTENSIONS) + r")(?:[?#]|$)|"
+    + "|".join(map(re.escape, BLOCKED_HOST_KEYWORDS)),
+    re.IGNORECASE,
+)
+
 
 # ---------------------------------------------------------------------------
 # Estrutura de resultado
@@ -98,20 +147,35 @@ def _detect_format(url: str) -> str:
 
 def _is_blacklisted(url: str) -> bool:
     """Retorna True se a URL contiver alguma palavra-chave da blacklist."""
-    url_lower = url.lower()
-    return any(keyword in url_lower for keyword in BLACKLIST_KEYWORDS)
+    return _BLACKLIST_RE.search(url) is not None
 
 
 def _is_media_url(url: str) -> bool:
     """Retorna True se a URL contiver uma extensão de mídia suportada."""
-    url_lower = url.lower()
-    return any(ext in url_lower for ext in MEDIA_EXTENSIONS)
+    return _MEDIA_RE.search(url) is not None
 
 
 def _is_priority(url: str) -> bool:
     """Retorna True se a URL for provavelmente uma playlist principal."""
-    url_lower = url.lower()
-    return any(kw in url_lower for kw in PRIORITY_KEYWORDS)
+    return _PRIORITY_RE.search(url) is not None
+
+
+def should_block_request(url: str, resource_type: str) -> bool:
+    """
+    Retorna True se a requisição pode ser abortada sem afetar a captura:
+    imagens, fontes, CSS ou hosts de rastreamento. Manifestos de mídia nunca
+    são bloqueados.
+
+    Só decide sobre as URLs que casam com ROUTE_FILTER_RE (extensões de
+    BLOCKED_URL_EXTENSIONS ou hosts de rastreamento); as demais, como imagens
+    sem extensão, não passam pela rota e nunca chegam aqui.
+    """
+    if _is_media_url(url):
+        return False
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urllib.parse.urlsplit(url).hostname or ""
+    return _BLOCKED_HOST_RE.search(host) is not None
 
 
 def normalize_stream_url(url: str) -> str:
@@ -144,6 +208,11 @@ def extract_embedded_url(url: str) -> Optional[str]:
 
     Retorna a URL embutida se encontrada e válida, caso contrário None.
     """
+    # Filtro rápido: a maioria das requisições não tem parâmetro algum ou não
+    # menciona uma extensão de mídia. Sem "%" a decodificação do parse_qs não
+    # pode fazer surgir um ".m3u8"/".mpd" que não esteja na URL bruta.
+    if "=" not in url or ("%" not in url and not _is_media_url(url)):
+        return None
     try:
         parsed = urllib.parse.urlparse(url)
         params = urllib.parse.parse_qs(parsed.query)
@@ -173,6 +242,9 @@ class NetworkCapture:
     >>> streams = capture.get_streams()
     """
 
+    # Atributos fixos: lidos em toda requisição da página por _process_url
+    __slots__ = ("deduplicate", "normalize", "_streams", "_seen_urls", "_drm_info")
+
     def __init__(self, deduplicate: bool = True, normalize: bool = True):
         """
         Parâmetros
@@ -184,7 +256,9 @@ class NetworkCapture:
         """
         self.deduplicate = deduplicate
         self.normalize = normalize
-        self._streams: List[CapturedStream] = []
+        # deque: URLs prioritárias entram pela esquerda em O(1), sem deslocar
+        # os demais itens como list.insert(0, ...) faria
+        self._streams: Deque[CapturedStream] = deque()
         self._seen_urls: Set[str] = set()
         self._drm_info: Optional[DRMInfo] = None
 
@@ -212,26 +286,29 @@ class NetworkCapture:
         url = request.url
         self._process_url(url)
 
-    def _process_url(self, raw_url: str) -> None:
-        """Processa uma URL bruta, verificando se é um stream válido."""
+    def _process_url(self, raw_url: str) -> bool:
+        """
+        Processa uma URL bruta, verificando se é um stream válido.
+        Retorna True se um novo stream foi capturado.
+        """
         # Verifica se há uma URL embutida nos parâmetros de redirecionamento
         embedded = extract_embedded_url(raw_url)
         url_to_check = embedded if embedded else raw_url
 
         # Verifica se é uma URL de mídia
         if not _is_media_url(url_to_check):
-            return
+            return False
 
         # Verifica se está na blacklist
         if _is_blacklisted(url_to_check):
-            return
+            return False
 
         # Normaliza a URL
         final_url = normalize_stream_url(url_to_check) if self.normalize else url_to_check
 
         # Deduplicação
         if self.deduplicate and final_url in self._seen_urls:
-            return
+            return False
 
         self._seen_urls.add(final_url)
 
@@ -245,9 +322,10 @@ class NetworkCapture:
 
         # URLs prioritárias vão para o início da lista
         if stream.is_priority:
-            self._streams.insert(0, stream)
+            self._streams.appendleft(stream)
         else:
             self._streams.append(stream)
+        return True
 
     def get_streams(self) -> List[CapturedStream]:
         """Retorna a lista de streams capturados, ordenada por prioridade."""
@@ -270,7 +348,8 @@ class NetworkCapture:
         2. Primeira URL prioritária (master/index/etc.)
         3. Primeira URL disponível
         """
-        streams = self.get_streams()
+        # Lê a lista interna direto: get_streams() faria uma cópia à toa
+        streams = self._streams
         if not streams:
             return None
 
@@ -293,7 +372,8 @@ class NetworkCapture:
 
     def has_priority_stream(self) -> bool:
         """Retorna True se pelo menos uma URL prioritária foi capturada."""
-        return any(s.is_priority for s in self._streams)
+        # URLs prioritárias são inseridas no início da lista: basta olhar a primeira
+        return bool(self._streams) and self._streams[0].is_priority
 
     def __len__(self) -> int:
         return len(self._streams)
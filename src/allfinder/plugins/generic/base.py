@@ -1,7 +1,33 @@
 from abc import ABC, abstractmethod
 from playwright.async_api import Page
+from typing import List, Optional
 import asyncio
 
+# Devolve o primeiro seletor com um elemento visível (com caixa na página e
+# sem visibility:hidden), ou null se nenhum estiver visível ainda.
+_FIRST_VISIBLE_JS = """(selectors) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (el && el.getClientRects().length && getComputedStyle(el).visibility !== 'hidden') {
+            return sel;
+        }
+    }
+    return null;
+}"""
+
+async def find_visible_selector(page: Page, selectors: List[str], timeout: int = 5000) -> Optional[str]:
+    """
+    Espera até `timeout` ms pelo primeiro seletor visível da lista, em ordem.
+
+    A varredura roda dentro da página (wait_for_function), então a lista toda
+    custa uma única espera em vez de uma espera por seletor.
+    """
+    try:
+        handle = await page.wait_for_function(_FIRST_VISIBLE_JS, arg=selectors, timeout=timeout)
+        return await handle.json_value()
+    except Exception:
+        return None
+
 class BasePlugin(ABC):
     @property
     @abstractmethod
@@ -42,17 +68,21 @@ class GenericPlugin(BasePlugin):
             '.play-icon'
         ]
         
-        # Tenta clicar no botão de play usando esperas inteligentes
-        for selector in play_selectors:
+        # A navegação retorna no "commit"; espera o DOM antes de procurar o player
+        try:
+            await page.wait_for_load_state("domcontentloaded", timeout=10000)
+        except:
+            pass
+
+        # Tenta clicar no primeiro botão de play visível
+        selector = await find_visible_selector(page, play_selectors)
+        if selector:
             try:
-                # Espera o seletor ficar visível por no máximo 5 segundos
-                await page.wait_for_selector(selector, state="visible", timeout=5000)
                 await page.click(selector)
                 # Espera o estado da rede ficar ocioso após o clique
                 await page.wait_for_load_state("networkidle", timeout=5000)
-                break
             except:
-                continue
+                pass
         
         # Em vez de sleep fixo de 20s, esperamos o estado da rede ou um tempo menor
         try:
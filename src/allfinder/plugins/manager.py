@@ -8,7 +8,7 @@ Plugins específicos de sites têm prioridade sobre o plugin genérico.
 """
 
 import re
-from typing import List
+from typing import List, Pattern, Tuple
 
 from allfinder.plugins.generic.base import BasePlugin, GenericPlugin
 from allfinder.plugins.specific_sites.globoplay import GloboplayPlugin
@@ -25,6 +25,8 @@ class PluginManager:
 
     def __init__(self):
         self.plugins: List[BasePlugin] = []
+        # domain_pattern de cada plugin, compilado uma vez no registro
+        self._patterns: List[Tuple[Pattern, BasePlugin]] = []
         self.generic_plugin = GenericPlugin()
         # Registra automaticamente os plugins específicos conhecidos
         self._register_defaults()
@@ -36,13 +38,14 @@ class PluginManager:
     def register_plugin(self, plugin: BasePlugin) -> None:
         """Registra um plugin no gerenciador."""
         self.plugins.append(plugin)
+        self._patterns.append((re.compile(plugin.domain_pattern, re.IGNORECASE), plugin))
 
     def get_plugin_for_url(self, url: str) -> BasePlugin:
         """
         Retorna o plugin mais adequado para a URL fornecida.
         Fallback: GenericPlugin.
         """
-        for plugin in self.plugins:
-            if re.search(plugin.domain_pattern, url, re.IGNORECASE):
+        for pattern, plugin in self._patterns:
+            if pattern.search(url):
                 return plugin
         return self.generic_plugin
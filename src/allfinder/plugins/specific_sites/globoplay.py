@@ -17,7 +17,13 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from playwright.async_api import Page
 
-from allfinder.plugins.generic.base import BasePlugin
+from allfinder.plugins.generic.base import BasePlugin, find_visible_selector
+
+
+# Prefixos e sufixos removidos por clean_channel_name()
+_GLOBOPLAY_PREFIX_RE = re.compile(r"^Globoplay\.\s*", re.IGNORECASE)
+_BBB_PREFIX_RE = re.compile(r"^Canal BBB \d+\s*-\s*", re.IGNORECASE)
+_LIVE_SUFFIX_RE = re.compile(r",?\s*Ao vivo.*$", re.IGNORECASE)
 
 
 class GloboplayPlugin(BasePlugin):
@@ -64,8 +70,13 @@ class GloboplayPlugin(BasePlugin):
         try:
             await page.wait_for_load_state("networkidle", timeout=10000)
         except Exception:
-            # networkidle pode falhar em páginas com muitas requisições contínuas
-            await asyncio.sleep(3)
+            # networkidle pode falhar em páginas com muitas requisições
+            # contínuas; espera no máximo 3s pelo evento "load", em vez de
+            # dormir 3s mesmo quando a página já terminou de carregar
+            try:
+                await page.wait_for_load_state("load", timeout=3000)
+            except Exception:
+                pass
 
     async def _dismiss_warning_modals(self, page: Page) -> None:
         """
@@ -113,14 +124,14 @@ class GloboplayPlugin(BasePlugin):
             "video",
         ]
 
-        for selector in play_selectors:
-            try:
-                await page.wait_for_selector(selector, state="visible", timeout=5000)
-                await page.click(selector)
-                await asyncio.sleep(1)
-                return
-            except Exception:
-                continue
+        selector = await find_visible_selector(page, play_selectors)
+        if not selector:
+            return
+        try:
+            await page.click(selector)
+            await asyncio.sleep(1)
+        except Exception:
+            pass
 
     async def scroll_to_load_all(self, page: Page, max_scrolls: int = 5) -> None:
         """
@@ -231,8 +242,8 @@ class GloboplayPlugin(BasePlugin):
             return ""
         if "Globo Internacional" in name:
             return "Globo Internacional"
-        name = re.sub(r"^Globoplay\.\s*", "", name, flags=re.IGNORECASE)
-        name = re.sub(r"^Canal BBB \d+\s*-\s*", "", name, flags=re.IGNORECASE)
-        name = re.sub(r",?\s*Ao vivo.*$", "", name, flags=re.IGNORECASE)
+        name = _GLOBOPLAY_PREFIX_RE.sub("", name)
+        name = _BBB_PREFIX_RE.sub("", name)
+        name = _LIVE_SUFFIX_RE.sub("", name)
         parts = [p.strip() for p in name.split(",") if p.strip()]
         return parts[0].strip() if parts else name.strip()
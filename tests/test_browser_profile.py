@@ -2,6 +2,7 @@
 Testes para o módulo allfinder.core.browser_profile.
 """
 
+import os
 import pytest
 from unittest.mock import patch, MagicMock
 from allfinder.core.browser_profile import (
@@ -11,6 +12,10 @@ from allfinder.core.browser_profile import (
     get_profile,
     build_playwright_launch_kwargs,
     _get_os,
+    _find_executable,
+    find_browser_executable,
+    _list_chromium_profiles,
+    _list_firefox_profiles,
 )
 
 
@@ -19,6 +24,18 @@ def test_get_os_returns_valid_value():
     assert os_name in ("windows", "linux", "macos")
 
 
+@pytest.mark.parametrize("platform_name, expected", [
+    ("win32", "windows"),
+    ("darwin", "macos"),
+    ("linux", "linux"),
+    # Como no platform.system() ("CYGWIN_NT-..."), Cygwin usa os caminhos Unix
+    ("cygwin", "linux"),
+])
+def test_get_os_maps_sys_platform(platform_name, expected):
+    with patch("allfinder.core.browser_profile.sys.platform", platform_name):
+        assert _get_os() == expected
+
+
 def test_detect_available_browsers_returns_dict():
     result = detect_available_browsers()
     assert isinstance(result, dict)
@@ -37,7 +54,7 @@ def test_list_profiles_returns_list():
 
 def test_get_profile_returns_none_when_no_profiles():
     """get_profile deve retornar None quando não há perfis disponíveis."""
-    with patch("allfinder.core.browser_profile.list_profiles", return_value=[]):
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=[]):
         result = get_profile("chrome", "Perfil Inexistente")
         assert result is None
 
@@ -50,7 +67,7 @@ def test_get_profile_returns_first_when_no_name():
         profile_dir="Default",
         user_data_dir="/fake/path",
     )
-    with patch("allfinder.core.browser_profile.list_profiles", return_value=[mock_profile]):
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=[mock_profile]):
         result = get_profile("chrome")
         assert result == mock_profile
 
@@ -62,7 +79,7 @@ def test_get_profile_by_exact_name():
         BrowserProfile("edge", "Pessoa 1", "Profile 1", "/fake"),
         BrowserProfile("edge", "Pessoa 2", "Profile 2", "/fake"),
     ]
-    with patch("allfinder.core.browser_profile.list_profiles", return_value=profiles):
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=profiles):
         result = get_profile("edge", "Pessoa 1")
         assert result is not None
         assert result.profile_name == "Pessoa 1"
@@ -73,7 +90,7 @@ def test_get_profile_by_partial_name():
     profiles = [
         BrowserProfile("chrome", "Meu Perfil Principal", "Profile 1", "/fake"),
     ]
-    with patch("allfinder.core.browser_profile.list_profiles", return_value=profiles):
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=profiles):
         result = get_profile("chrome", "Principal")
         assert result is not None
         assert "Principal" in result.profile_name
@@ -131,3 +148,152 @@ def test_build_playwright_launch_kwargs_chrome():
     kwargs = build_playwright_launch_kwargs(profile)
     assert kwargs["browser_type"] == "chromium"
     assert kwargs["channel"] == "chrome"
+
+
+def test_find_executable_checks_paths_and_path_names(tmp_path):
+    """_find_executable deve aceitar caminhos existentes e nomes do PATH."""
+    exe = tmp_path / "browser"
+    exe.write_text("")
+    assert _find_executable([str(tmp_path / "ausente"), str(exe)]) == str(exe)
+    with patch("allfinder.core.browser_profile.shutil.which", return_value="/usr/bin/msedge") as which:
+        assert _find_executable([str(tmp_path / "ausente"), "msedge"]) == "/usr/bin/msedge"
+        which.assert_called_once_with("msedge")
+
+
+def test_find_browser_executable_is_memoized():
+    """find_browser_executable deve sondar o sistema uma única vez por navegador."""
+    find_browser_executable.cache_clear()
+    try:
+        with patch("allfinder.core.browser_profile._find_executable", return_value=None) as finder:
+            find_browser_executable("firefox")
+            find_browser_executable("firefox")
+            assert finder.call_count == 1
+    finally:
+        find_browser_executable.cache_clear()
+
+
+def test_list_chromium_profiles_reads_names(tmp_path):
+    """_list_chromium_profiles deve ler o nome amigável de cada perfil."""
+    (tmp_path / "Default").mkdir()
+    (tmp_path / "Default" / "Preferences").write_text('{"profile": {"name": "Pessoa 1"}}', encoding="utf-8")
+    (tmp_path / "Profile 2").mkdir()
+    (tmp_path / "Profile 2" / "Preferences").write_text("{corrompido", encoding="utf-8")
+    (tmp_path / "Crashpad").mkdir()
+    assert sorted(_list_chromium_profiles(str(tmp_path))) == [
+        ("Pessoa 1", "Default"),
+        ("Profile 2", "Profile 2"),
+    ]
+    assert _list_chromium_profiles(str(tmp_path / "inexistente")) == []
+
+
+def test_list_chromium_profiles_prefers_local_state(tmp_path):
+    """Os nomes do Local State devem evitar a leitura do Preferences."""
+    (tmp_path / "Local State").write_text(
+        '{"profile": {"info_cache": {"Default": {"name": "Trabalho"}}}}', encoding="utf-8"
+    )
+    (tmp_path / "Default").mkdir()
+    (tmp_path / "Default" / "Preferences").write_text('{"profile": {"name": "Antigo"}}', encoding="utf-8")
+    (tmp_path / "Profile 1").mkdir()
+    (tmp_path / "Profile 1" / "Preferences").write_text('{"profile": {"name": "Pessoa 1"}}', encoding="utf-8")
+    assert sorted(_list_chromium_profiles(str(tmp_path))) == [
+        ("Pessoa 1", "Profile 1"),
+        ("Trabalho", "Default"),
+    ]
+
+
+def test_list_firefox_profiles_finds_ini_inside_profiles_dir(tmp_path):
+    """No Linux o profiles.ini fica dentro da própria pasta de perfis."""
+    (tmp_path / "abc.default-release").mkdir()
+    (tmp_path / "profiles.ini").write_text(
+        "[General]\nStartWithLastProfile=1\n\n"
+        "[Profile0]\nName=default-release\nIsRelative=1\nPath=abc.default-release\n",
+        encoding="utf-8",
+    )
+    assert _list_firefox_profiles(str(tmp_path)) == [
+        ("default-release", str(tmp_path / "abc.default-release")),
+    ]
+
+
+def test_list_firefox_profiles_parses_relative_and_absolute_paths(tmp_path):
+    """Seções que não são [ProfileN] devem ser ignoradas; IsRelative=0 mantém o caminho."""
+    (tmp_path / "profiles.ini").write_text(
+        "[Install4F96D1932A9F858E]\nDefault=Profiles/abc.default\n\n"
+        "[Profile1]\nName=Trabalho\nIsRelative=0\nPath=/opt/ff/trabalho\n\n"
+        "; comentário\n[Profile0]\nIsRelative=1\nPath=Profiles/abc.default\n",
+        encoding="utf-8",
+    )
+    assert _list_firefox_profiles(str(tmp_path / "Profiles")) == [
+        ("Trabalho", os.path.normpath("/opt/ff/trabalho")),
+        ("Profile0", str(tmp_path / "Profiles" / "abc.default")),
+    ]
+
+
+def test_list_chromium_profiles_without_names_skips_json(tmp_path):
+    """Com read_names=False basta o Preferences existir; nenhum JSON é lido."""
+    (tmp_path / "Local State").write_text("{corrompido", encoding="utf-8")
+    (tmp_path / "Default").mkdir()
+    (tmp_path / "Default" / "Preferences").write_text("{corrompido", encoding="utf-8")
+    (tmp_path / "Crashpad").mkdir()
+    with patch("allfinder.core.browser_profile._json_loads") as loads:
+        assert _list_chromium_profiles(str(tmp_path), read_names=False) == [("Default", "Default")]
+        loads.assert_not_called()
+
+
+def test_get_profile_without_name_reads_only_chosen_name(tmp_path):
+    """get_profile(browser) deve ler apenas o nome do perfil escolhido."""
+    profiles = [
+        BrowserProfile("chrome", "Profile 1", "Profile 1", str(tmp_path)),
+        BrowserProfile("chrome", "Default", "Default", str(tmp_path)),
+    ]
+    (tmp_path / "Local State").write_text(
+        '{"profile": {"info_cache": {"Default": {"name": "Pessoa 1"}}}}', encoding="utf-8"
+    )
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=profiles) as lister:
+        result = get_profile("chrome")
+    lister.assert_called_once_with("chrome", read_names=False, first_only=True)
+    assert (result.profile_dir, result.profile_name) == ("Default", "Pessoa 1")
+
+
+def test_list_profiles_first_only_stops_at_first_data_dir(tmp_path):
+    """first_only deve parar no primeiro diretório de dados com perfis."""
+    dirs = (str(tmp_path / "google-chrome"), str(tmp_path / "chromium"))
+    listed = []
+
+    def fake_list(user_data_dir, read_names=True):
+        listed.append(user_data_dir)
+        return [("Default", "Default")]
+
+    with patch("allfinder.core.browser_profile._get_user_data_dirs", return_value=dirs), \
+            patch("allfinder.core.browser_profile._list_chromium_profiles", side_effect=fake_list):
+        assert len(list_profiles("chrome", first_only=True)) == 1
+        assert listed == [dirs[0]]
+        assert len(list_profiles("chrome")) == 2
+
+
+def test_list_profiles_skips_data_dirs_known_missing(tmp_path):
+    """Um diretório de dados inexistente só deve ser sondado uma vez."""
+    missing = str(tmp_path / "inexistente")
+    with patch("allfinder.core.browser_profile._get_user_data_dirs", return_value=(missing,)), \
+            patch("allfinder.core.browser_profile._MISSING_DATA_DIRS", set()), \
+            patch("allfinder.core.browser_profile.os.scandir", side_effect=FileNotFoundError) as scandir:
+        assert list_profiles("chrome") == []
+        assert list_profiles("chrome") == []
+        scandir.assert_called_once_with(missing)
+
+
+def test_get_profile_prefers_exact_name_over_earlier_partial():
+    """Um nome exato deve vencer uma correspondência parcial listada antes."""
+    profiles = [
+        BrowserProfile("chrome", "Pessoa 10", "Profile 10", "/fake"),
+        BrowserProfile("chrome", "Pessoa 1", "Profile 1", "/fake"),
+    ]
+    with patch("allfinder.core.browser_profile.iter_profiles", return_value=iter(profiles)):
+        assert get_profile("chrome", "pessoa 1").profile_dir == "Profile 1"
+
+
+def test_browser_profile_is_frozen_and_hashable():
+    """BrowserProfile é imutável e pode ser usado como chave de dict/set."""
+    profile = BrowserProfile("chrome", "Default", "Default", "/fake")
+    with pytest.raises(AttributeError):
+        profile.profile_name = "Outro"
+    assert {profile: 1}[BrowserProfile("chrome", "Default", "Default", "/fake")] == 1
@@ -1,6 +1,10 @@
 import pytest
+import asyncio
 import json
-from allfinder.core.extractor import M3U8Extractor
+import os
+from types import SimpleNamespace
+import allfinder.core.extractor as extractor_module
+from allfinder.core.extractor import M3U8Extractor, _ExtractionState
 
 def test_validate_url_valid():
     extractor = M3U8Extractor()
@@ -20,13 +24,89 @@ def test_validate_url_ssrf_prevention():
     assert extractor.validate_url("http://10.0.0.1") is False
     assert extractor.validate_url("http://172.16.0.1") is False
 
+def test_validate_url_private_host_edge_cases():
+    extractor = M3U8Extractor()
+    assert extractor.validate_url("http://[::1]/live") is False
+    assert extractor.validate_url("http://0.0.0.0:8080") is False
+    assert extractor.validate_url("http://172.20.1.1") is False
+    assert extractor.validate_url("https://cdn10.example.com/live") is True
+    assert extractor.validate_url("https://localhostexample.com") is True
+    for host in ("127.1", "2130706433", "0x7f000001", "017700000001", "0",
+                 "localhost.", "10.1", "0300.0250.1.1"):
+        assert extractor.validate_url(f"http://{host}/") is False, host
+    assert extractor.validate_url("https://1a.example.com/live") is True
+    # Públicos, mas fora da forma canônica: recusados como no validators
+    assert extractor.validate_url("http://134744072/") is False
+    assert extractor.validate_url("http://8.8.8.8/") is True
+
 def test_extractor_initialization():
     extractor = M3U8Extractor(headless=False, timeout=5000, cookies_from_browser="chrome")
     assert extractor.headless is False
     assert extractor.timeout == 5000
     assert extractor.cookies_from_browser == "chrome"
-    assert extractor.found_urls == []
-    assert extractor.page_title == "Stream"
+
+def test_extraction_state_is_per_call():
+    first = _ExtractionState()
+    second = _ExtractionState()
+    assert first.page_title == "Stream"
+    assert first.thumbnail_url is None
+    first.capture._process_url("https://cdn.example.com/master.m3u8")
+    assert first.capture.has_streams()
+    assert not second.capture.has_streams()
+    assert not second.stream_found.is_set()
+
+def test_handle_request_stops_capturing_after_priority_stream():
+    extractor = M3U8Extractor()
+    state = _ExtractionState()
+    extractor._handle_request(SimpleNamespace(url="https://cdn.example.com/playlist.m3u8", method="GET"), state)
+    assert state.stream_found.is_set()
+    assert state.main_found.is_set()
+    extractor._handle_request(SimpleNamespace(url="https://cdn.example.com/video/master.m3u8", method="GET"), state)
+    assert state.capture.get_urls() == ["https://cdn.example.com/playlist.m3u8"]
+
+def test_handle_request_sees_drm_after_master_playlist():
+    extractor = M3U8Extractor()
+    state = _ExtractionState()
+    extractor._handle_request(SimpleNamespace(url="https://cdn.example.com/master.m3u8", method="GET"), state)
+    assert state.main_found.is_set()
+    kid = "0123456789abcdef0123456789abcdef"
+    license_request = SimpleNamespace(
+        url=f"https://lic.example.com/widevine/license?kid={kid}",
+        method="POST",
+        post_data_buffer=b"\x08\x01\x12\x10" + b"k" * 16,
+    )
+    extractor._handle_request(license_request, state)
+    drm = state.capture.get_drm_info()
+    assert drm.license_url == license_request.url
+    assert drm.pssh == (b"k" * 16).hex()
+    assert drm.kid == kid
+
+class _FakePage:
+    def once(self, event, callback):
+        pass
+
+    def remove_listener(self, event, callback):
+        pass
+
+def test_wait_for_stream_gives_main_playlist_a_grace_period(monkeypatch):
+    monkeypatch.setattr(extractor_module, "_MAIN_PLAYLIST_GRACE", 0.2)
+    extractor = M3U8Extractor(timeout=5000)
+
+    async def run():
+        state = _ExtractionState()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, extractor._handle_request,
+                        SimpleNamespace(url="https://cdn.example.com/v1/seg.m3u8", method="GET"), state)
+        loop.call_later(0.1, extractor._handle_request,
+                        SimpleNamespace(url="https://cdn.example.com/master.m3u8", method="GET"), state)
+        start = loop.time()
+        await extractor._wait_for_stream(_FakePage(), state)
+        return loop.time() - start, state
+
+    elapsed, state = asyncio.run(run())
+    assert state.main_found.is_set()
+    assert elapsed < 0.2
+    assert state.capture.get_urls()[0] == "https://cdn.example.com/master.m3u8"
 
 def test_parse_cookies_json(tmp_path):
     d = tmp_path / "cookies.json"
@@ -48,3 +128,256 @@ def test_parse_cookies_txt(tmp_path):
     assert len(parsed) == 1
     assert parsed[0]['name'] == "name"
     assert parsed[0]['value'] == "value"
+
+def test_session_path_is_per_host(tmp_path):
+    extractor = M3U8Extractor(session_dir=str(tmp_path))
+    path = extractor._session_path("https://GloboPlay.globo.com/v/123/")
+    assert path == str(tmp_path / "globoplay.globo.com.json")
+    assert extractor._session_path("https://g1.globo.com/") != path
+    assert M3U8Extractor()._session_path("https://globoplay.globo.com/") is None
+
+@pytest.mark.skipif(os.name != "posix", reason="permissões POSIX")
+def test_save_session_is_private_to_the_user(tmp_path):
+    session_dir = tmp_path / "sessions"
+    extractor = M3U8Extractor(session_dir=str(session_dir))
+    state = {"cookies": [{"name": "sid", "value": "segredo"}], "origins": []}
+
+    class FakeContext:
+        async def storage_state(self):
+            return state
+
+    asyncio.run(extractor._save_session(FakeContext(), "https://globoplay.globo.com/"))
+    path = extractor._session_path("https://globoplay.globo.com/")
+    assert json.loads(open(path, encoding="utf-8").read()) == state
+    assert os.stat(session_dir).st_mode & 0o777 == 0o700
+    assert os.stat(path).st_mode & 0o777 == 0o600
+
+def test_crawl4ai_fallback_crawler_is_shared(monkeypatch):
+    created = []
+
+    class FakeCrawler:
+        def __init__(self):
+            self.started = 0
+            self.closed = False
+            created.append(self)
+
+        async def start(self):
+            self.started += 1
+            await asyncio.sleep(0)
+
+        async def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(extractor_module, "Crawl4AI", FakeCrawler)
+    extractor = M3U8Extractor()
+
+    async def run():
+        first, second = await asyncio.gather(extractor._get_crawler(), extractor._get_crawler())
+        assert first is second
+        await extractor.close()
+
+    asyncio.run(run())
+    assert len(created) == 1
+    assert created[0].started == 1
+    assert created[0].closed
+    assert extractor._crawler is None
+
+def test_concurrent_extract_of_same_url_runs_once(monkeypatch):
+    extractor = M3U8Extractor()
+    extractor._playwright = object()
+    calls = []
+
+    async def fake_extract_page(url, plugin):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return {"urls": [url + "/master.m3u8"], "title": "T", "thumbnail": None, "drm_info": None}
+
+    monkeypatch.setattr(extractor, "_extract_page", fake_extract_page)
+
+    async def run():
+        results = await asyncio.gather(
+            extractor.extract("https://example.com/live", None),
+            extractor.extract("https://example.com/live", None),
+            extractor.extract("https://example.com/outra", None),
+        )
+        again = await extractor.extract("https://example.com/live", None)
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert results[0] == results[1]
+    assert calls == ["https://example.com/live", "https://example.com/outra", "https://example.com/live"]
+    assert again == results[0]
+    assert extractor._inflight == {}
+
+def test_cancelling_first_caller_keeps_shared_extraction(monkeypatch):
+    extractor = M3U8Extractor()
+    extractor._playwright = object()
+    calls = []
+
+    async def fake_extract_page(url, plugin):
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return {"urls": [url + "/master.m3u8"], "title": "T", "thumbnail": None, "drm_info": None}
+
+    monkeypatch.setattr(extractor, "_extract_page", fake_extract_page)
+
+    async def run():
+        first = asyncio.ensure_future(extractor.extract("https://example.com/live", None))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(extractor.extract("https://example.com/live", None))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    result = asyncio.run(run())
+    assert result["urls"] == ["https://example.com/live/master.m3u8"]
+    assert calls == ["https://example.com/live"]
+
+def test_result_cache_respects_ttl(tmp_path, monkeypatch):
+    extractor = M3U8Extractor(cache_dir=str(tmp_path), cache_ttl=60)
+    result = {
+        "urls": ["https://cdn.example.com/master.m3u8"],
+        "title": "Canal",
+        "thumbnail": None,
+        "drm_info": extractor_module.DRMInfo(license_url="https://lic.example.com", kid="ab" * 16),
+    }
+    extractor._store_result("https://example.com/live", result)
+    assert extractor._load_cached_result("https://example.com/live") == result
+    assert extractor._load_cached_result("https://example.com/outra") is None
+
+    now = extractor_module.time.time()
+    monkeypatch.setattr(extractor_module.time, "time", lambda: now + 61)
+    assert extractor._load_cached_result("https://example.com/live") is None
+
+def test_result_cache_key_depends_on_browser_options(tmp_path):
+    url = "https://example.com/live"
+
+    def path(**kwargs):
+        return M3U8Extractor(cache_dir=str(tmp_path), cache_ttl=60, **kwargs)._cache_path(url)
+
+    base = path()
+    assert path() == base
+    assert path(browser="edge") != base
+    assert path(browser="edge", use_profile=True) != path(browser="edge")
+    assert path(use_profile=True, profile_name="Pessoa 1") != path(use_profile=True)
+    assert path(cookies_file="cookies.txt") != base
+    assert path(cookies_from_browser="chrome") == path(cookies_file="cookies.txt")
+
+def test_result_cache_disabled_by_default(tmp_path):
+    extractor = M3U8Extractor(cache_dir=str(tmp_path))
+    extractor._store_result("https://example.com/live", {"urls": ["x"], "drm_info": None})
+    assert list(tmp_path.iterdir()) == []
+
+def test_parse_cookies_txt_skips_comments_and_bad_expiry(tmp_path):
+    d = tmp_path / "cookies.txt"
+    d.write_text(
+        "# Netscape HTTP Cookie File\n\n"
+        "example.com\tTRUE\t/\tTRUE\tsessao\tsid\tabc\r\n"
+        "linha\tquebrada\n"
+    )
+    parsed = M3U8Extractor(cookies_file=str(d))._parse_cookies_file()
+    assert parsed == [{
+        "name": "sid", "value": "abc", "domain": "example.com", "path": "/",
+        "expires": -1, "httpOnly": True, "secure": True,
+    }]
+
+def test_parse_cookies_txt_keeps_quotes_and_survives_bad_bytes(tmp_path):
+    d = tmp_path / "cookies.txt"
+    d.write_bytes(
+        b"example.com\tFALSE\t/\tFALSE\t0\tprefs\t\"a,b\"\n"
+        b"example.com\tFALSE\t/\tFALSE\t0\tlixo\t\xff\n"
+    )
+    parsed = M3U8Extractor(cookies_file=str(d))._parse_cookies_file()
+    assert [c["value"] for c in parsed] == ['"a,b"', "\ufffd"]
+
+def test_parse_cookies_json_cleans_fields(tmp_path):
+    d = tmp_path / "cookies.json"
+    d.write_text(json.dumps({"cookies": [
+        {"name": "a", "value": "1", "domain": "example.com", "path": "/", "sameSite": "no_restriction", "secure": "TRUE"},
+    ]}))
+    parsed = M3U8Extractor(cookies_file=str(d))._parse_cookies_file()
+    assert parsed == [{"name": "a", "value": "1", "domain": "example.com", "path": "/", "secure": True}]
+
+def test_collect_cookies_reads_file_once(tmp_path, monkeypatch):
+    d = tmp_path / "cookies.txt"
+    d.write_text("example.com\tTRUE\t/\tFALSE\t1700000000\tname\tvalue\n")
+    extractor = M3U8Extractor(cookies_file=str(d))
+    reads = []
+    parse = extractor._parse_cookies_file
+
+    def counting_parse():
+        reads.append(True)
+        return parse()
+
+    monkeypatch.setattr(extractor, "_parse_cookies_file", counting_parse)
+
+    async def run():
+        return await asyncio.gather(
+            extractor._collect_cookies("https://example.com/a"),
+            extractor._collect_cookies("https://example.com/b"),
+        )
+
+    first, second = asyncio.run(run())
+    assert first == second and first[0]["name"] == "name"
+    assert reads == [True]
+
+def test_max_pages_limits_open_pages(monkeypatch):
+    extractor = M3U8Extractor(max_pages=2)
+    extractor._playwright = object()
+    open_pages = []
+    peak = []
+
+    async def fake_extract_page(url, plugin):
+        open_pages.append(url)
+        peak.append(len(open_pages))
+        await asyncio.sleep(0.01)
+        open_pages.remove(url)
+        return {"urls": [], "title": "T", "thumbnail": None, "drm_info": None}
+
+    monkeypatch.setattr(extractor, "_extract_page", fake_extract_page)
+
+    async def run():
+        await asyncio.gather(*(extractor.extract(f"https://example.com/{i}", None) for i in range(5)))
+
+    asyncio.run(run())
+    assert max(peak) == 2
+
+def test_concurrent_extract_without_start_shares_one_browser(monkeypatch):
+    extractor = M3U8Extractor()
+    events = []
+
+    async def fake_start():
+        events.append("start")
+        await asyncio.sleep(0.01)
+        extractor._playwright = object()
+
+    async def fake_close():
+        events.append("close")
+        extractor._playwright = None
+
+    async def fake_extract_page(url, plugin):
+        assert extractor._playwright is not None
+        await asyncio.sleep(0.02 if url.endswith("lenta") else 0.01)
+        assert extractor._playwright is not None
+        return {"urls": [], "title": "T", "thumbnail": None, "drm_info": None}
+
+    monkeypatch.setattr(extractor, "start", fake_start)
+    monkeypatch.setattr(extractor, "close", fake_close)
+    monkeypatch.setattr(extractor, "_extract_page", fake_extract_page)
+
+    async def run():
+        await asyncio.gather(
+            extractor.extract("https://example.com/rapida", None),
+            extractor.extract("https://example.com/lenta", None),
+        )
+        await extractor.extract("https://example.com/depois", None)
+
+    asyncio.run(run())
+    assert events == ["start", "close", "start", "close"]
+    assert extractor._adhoc_users == 0
+
+def test_parse_cookies_missing_file(tmp_path):
+    extractor = M3U8Extractor(cookies_file=str(tmp_path / "ausente.txt"))
+    assert extractor._parse_cookies_file() == []
@@ -8,6 +8,8 @@ from allfinder.core.network_capture import (
     CapturedStream,
     normalize_stream_url,
     extract_embedded_url,
+    should_block_request,
+    ROUTE_FILTER_RE,
     _is_blacklisted,
     _is_media_url,
     _is_priority,
@@ -83,6 +85,34 @@ def test_extract_embedded_url_not_found():
     assert result is None
 
 
+def test_extract_embedded_url_skips_urls_without_media():
+    url = "https://analytics.example.com/track?url=https://example.com/page.html"
+    assert extract_embedded_url(url) is None
+
+
+def test_extract_embedded_url_decodes_encoded_extension():
+    url = "https://t.example.com/r?redir=https%3A%2F%2Fcdn.example.com%2Flive%2Em3u8"
+    assert extract_embedded_url(url) == "https://cdn.example.com/live.m3u8"
+
+
+def test_should_block_request_heavy_resources():
+    assert should_block_request("https://cdn.example.com/poster.jpg", "image") is True
+    assert should_block_request("https://cdn.example.com/font.woff2", "font") is True
+    assert should_block_request("https://cdn.example.com/style.css", "stylesheet") is True
+
+
+def test_should_block_request_tracker_hosts():
+    assert should_block_request("https://securepubads.g.doubleclick.net/gampad/ads", "script") is True
+    assert should_block_request("https://sb.scorecardresearch.com/beacon.js", "script") is True
+
+
+def test_should_block_request_keeps_page_and_streams():
+    assert should_block_request("https://video.globo.com/player.js", "script") is False
+    assert should_block_request("https://blog.example.com/catalog/", "document") is False
+    assert should_block_request("https://cdn.example.com/live/master.m3u8", "media") is False
+    assert should_block_request("https://cdn.example.com/manifest.mpd", "xhr") is False
+
+
 # ---------------------------------------------------------------------------
 # Testes da classe NetworkCapture
 # ---------------------------------------------------------------------------
@@ -169,7 +199,32 @@ def test_network_capture_has_priority_stream():
     assert capture.has_priority_stream()
 
 
+def test_network_capture_has_priority_stream_after_other_streams():
+    capture = NetworkCapture()
+    capture._process_url("https://cdn.example.com/seg001.m3u8")
+    assert not capture.has_priority_stream()
+    capture._process_url("https://cdn.example.com/master.m3u8")
+    capture._process_url("https://cdn.example.com/seg002.m3u8")
+    assert capture.has_priority_stream()
+
+
 def test_network_capture_no_priority_stream():
     capture = NetworkCapture()
     capture._process_url("https://cdn.example.com/seg001.m3u8")
     assert not capture.has_priority_stream()
+
+
+def test_network_capture_process_url_reports_new_streams():
+    capture = NetworkCapture()
+    assert capture._process_url("https://cdn.example.com/master.m3u8") is True
+    assert capture._process_url("https://cdn.example.com/master.m3u8") is False
+    assert capture._process_url("https://cdn.example.com/app.js") is False
+
+
+def test_route_filter_pattern_skips_streams():
+    assert ROUTE_FILTER_RE.search("https://cdn.example.com/poster.JPG?w=640")
+    assert ROUTE_FILTER_RE.search("https://cdn.example.com/fonts/a.woff2")
+    assert ROUTE_FILTER_RE.search("https://securepubads.g.doubleclick.net/gampad/ads")
+    assert not ROUTE_FILTER_RE.search("https://cdn.example.com/live/master.m3u8")
+    assert not ROUTE_FILTER_RE.search("https://cdn.example.com/live/seg_001.ts")
+    assert not ROUTE_FILTER_RE.search("https://cdn.example.com/app.cssx.js")
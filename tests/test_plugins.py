@@ -1,6 +1,7 @@
+import asyncio
 import pytest
 from allfinder.plugins.manager import PluginManager
-from allfinder.plugins.generic.base import GenericPlugin, BasePlugin
+from allfinder.plugins.generic.base import GenericPlugin, BasePlugin, find_visible_selector
 
 class MockPlugin(BasePlugin):
     @property
@@ -32,3 +33,30 @@ def test_plugin_manager_get_plugin_for_url():
     # Deve retornar o GenericPlugin para outros domínios
     plugin = manager.get_plugin_for_url("https://outro.com/video")
     assert isinstance(plugin, GenericPlugin)
+
+class _FakeHandle:
+    def __init__(self, value):
+        self.value = value
+
+    async def json_value(self):
+        return self.value
+
+class _FakePage:
+    def __init__(self, visible=None):
+        self.visible = visible
+        self.calls = []
+
+    async def wait_for_function(self, script, arg=None, timeout=None):
+        self.calls.append(arg)
+        if self.visible is None:
+            raise TimeoutError("nenhum seletor visível")
+        return _FakeHandle(self.visible)
+
+def test_find_visible_selector_single_wait():
+    page = _FakePage(visible=".play-button")
+    selectors = ["button.poster__play-wrapper", ".play-button", "video"]
+    assert asyncio.run(find_visible_selector(page, selectors)) == ".play-button"
+    assert page.calls == [selectors]
+
+def test_find_visible_selector_timeout_returns_none():
+    assert asyncio.run(find_visible_selector(_FakePage(), ["video"])) is None
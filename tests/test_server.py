@@ -0,0 +1,114 @@
+import asyncio
+import socket
+import threading
+import time
+import pytest
+import allfinder.cli.server as server_module
+from allfinder.cli.server import RemoteExtractor, serve
+from allfinder.core.network_capture import DRMInfo
+from allfinder.plugins.manager import PluginManager
+
+
+class FakeExtractor:
+    def __init__(self):
+        self.started = False
+        self.closed = False
+
+    async def start(self):
+        self.started = True
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def extract(self, url, plugin):
+        return {
+            "urls": [url + "/playlist.m3u8"],
+            "title": "Ao Vivo",
+            "thumbnail": None,
+            "drm_info": DRMInfo(kid="0" * 32),
+        }
+
+
+async def _roundtrip(port):
+    extractor = FakeExtractor()
+    ready = asyncio.Event()
+    server_task = asyncio.ensure_future(serve(extractor, PluginManager(), port=port, ready=ready))
+    await asyncio.wait_for(ready.wait(), 5)
+    try:
+        remote = RemoteExtractor(f"http://127.0.0.1:{port}")
+        data = await remote.extract("https://exemplo.com/live")
+        with pytest.raises(RuntimeError):
+            remote.endpoint = f"http://127.0.0.1:{port}/outro"
+            await remote.extract("https://exemplo.com/live")
+    finally:
+        server_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server_task
+    return extractor, data
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_serve_and_remote_extractor_roundtrip():
+    extractor, data = asyncio.run(_roundtrip(_free_port()))
+    assert extractor.started and extractor.closed
+    assert data["urls"] == ["https://exemplo.com/live/playlist.m3u8"]
+    assert data["title"] == "Ao Vivo"
+    assert data["drm_info"] == DRMInfo(kid="0" * 32)
+
+
+def test_remote_extractor_limits_concurrent_requests():
+    remote = RemoteExtractor("http://127.0.0.1:1", max_requests=2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def fake_post(url):
+        with lock:
+            active.append(url)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(url)
+        return {"urls": [url], "drm_info": None}
+
+    remote._post = fake_post
+
+    async def run():
+        return await asyncio.gather(*(remote.extract(f"https://exemplo.com/{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert [r["urls"] for r in results] == [[f"https://exemplo.com/{i}"] for i in range(5)]
+    assert max(peak) == 2
+
+
+def test_serve_times_out_silent_clients(monkeypatch):
+    monkeypatch.setattr(server_module, "REQUEST_READ_TIMEOUT", 0.05)
+    port = _free_port()
+
+    async def run():
+        ready = asyncio.Event()
+        server_task = asyncio.ensure_future(serve(FakeExtractor(), PluginManager(), port=port, ready=ready))
+        await asyncio.wait_for(ready.wait(), 5)
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+        finally:
+            server_task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await server_task
+        return response
+
+    assert asyncio.run(run()).startswith(b"HTTP/1.1 408 ")